@@ -0,0 +1,189 @@
+"""데이터 파이프라인 벤치마크 (FINRA 수집/파싱, 공매도 매트릭스, VWAP, 펀더멘털, 병합/점수 계산, 차트 생성, 레플리카 공유 캐시)
+
+기록(또는 생성)된 픽스처를 로컬 HTTP 서버와 yfinance 대역으로 재생해
+네트워크 상태와 무관하게 같은 입력으로 콜드/웜 로드와 종목 수별 확장성을 측정
+
+실행:
+  python benchmarks/bench_pipeline.py                     # 픽스처가 없으면 가상 데이터 생성 후 측정
+  python benchmarks/bench_pipeline.py --sizes 9 100 1000 --json bench.json
+  python benchmarks/bench_pipeline.py --record AAPL MSFT  # 실제 FINRA/Yahoo 응답을 픽스처로 기록
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import charts
+import data_service
+import price_data
+from cache_utils import NegativeCache
+from scoring import short_pressure_scores
+from finra_data import FinraArchive, FinraDayStore, screen_short_volume, short_ratio_panel
+from shared_cache import RedisBackend, SharedCache, SQLiteBackend
+
+from fixtures import (FIXTURE_DIR, FixtureServer, LocalRedis, ReplayYahoo, load_manifest, record_fixtures,
+                      synthesize_fixtures)
+
+DEFAULT_SIZES = [9, 100, 1000]
+
+
+def measure(setup, run):
+    """setup()은 측정에서 제외. 지연시간과 tracemalloc 최대 메모리를 각각 새 상태에서 측정"""
+    state = setup()
+    start = time.perf_counter()
+    run(state)
+    elapsed = time.perf_counter() - start
+
+    state = setup()
+    tracemalloc.start()
+    try:
+        run(state)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return elapsed, peak
+
+
+def pipeline_stages(manifest, server, replay, tickers, archive_root):
+    dates = manifest['dates']
+    anchor = pd.Timestamp(manifest['quarter_start'])
+
+    def cold_store(shared=None):
+        # 메모리/디스크 모두 비어 있는 상태 → HTTP로 전 구간 수집 (shared가 있으면 다른 레플리카의 결과 재사용)
+        return FinraDayStore(url_template=server.url_template, archive=None, misses=NegativeCache(), shared=shared)
+
+    def disk_store():
+        # 프로세스 재시작 직후: 디스크 아카이브만 있는 상태
+        return FinraDayStore(url_template=server.url_template, archive=FinraArchive(archive_root),
+                             misses=NegativeCache(), shared=None)
+
+    warm = disk_store()
+    warm.matrix(dates)
+
+    def fresh_engine(shared=None):
+        return price_data.AnchoredVWAPEngine(min_refresh_seconds=0, misses=NegativeCache(), shared=shared)
+
+    # 새 레플리카의 콜드 스타트: 다른 레플리카가 이미 채운 공유 캐시(SQLite / Redis 대역)만 있는 상태
+    shared_backends = {
+        'sqlite': SharedCache(SQLiteBackend(os.path.join(archive_root, f"shared-{len(tickers)}.db"))),
+        'redis': SharedCache(RedisBackend(LocalRedis())),
+    }
+    for shared in shared_backends.values():
+        for date_str in dates:
+            shared.set(server.url_template.format(date=date_str), warm.get_day(date_str))
+        fresh_engine(shared).refresh(tickers, anchor)
+
+    def warm_engine():
+        engine = fresh_engine()
+        engine.refresh(tickers, anchor)
+        engine.mark_stale()
+        return engine
+
+    def fundamentals(_):
+        price_data.yahoo_misses.forget()
+        with ThreadPoolExecutor(max_workers=18) as pool:
+            return list(pool.map(price_data.fetch_fundamentals, tickers))
+
+    # 대시보드와 같은 방식으로 종목 요약/공매도 행을 만든 뒤 병합·점수 계산만 측정
+    frames = warm_engine().refresh(tickers, anchor)
+    vwap_results = [data_service.summarize_vwap(t, frames[t], replay.info.get(t, {})) for t in tickers]
+    matrix = warm.matrix(dates)
+
+    def short_row(ticker):
+        info = replay.info.get(ticker)
+        yf_data = data_service.short_interest_from_snapshot(ticker, {**info, 'fetched_at': datetime.now()}) if info else None
+        return data_service.combine_short_data(ticker, yf_data, data_service.summarize_finra(ticker, matrix, False))
+
+    short_results = [short_row(t) for t in tickers]
+    df_results = data_service.build_results([r for r in vwap_results if r], short_results)
+    # 시계열 탭은 선택 가능한 종목(최대 MAG 7+2) 수만큼만 그리므로 그 크기로 측정
+    ts_tickers = list(tickers[:len(data_service.MAG7_STOCKS)])
+
+    def timeseries_charts(panel):
+        return [charts.ts_all(panel['short_ratio']), charts.ts_individual(panel['short_ratio'], panel['ma'], ts_tickers),
+                charts.volume_vs_short(panel['recent']), charts.volatility_box(panel['short_ratio'], ts_tickers)]
+
+    return [
+        ('finra.cold_http', cold_store, lambda store: store.matrix(dates)),
+        ('finra.warm_disk', disk_store, lambda store: store.matrix(dates)),
+        ('finra.warm_memory', lambda: warm, lambda store: store.matrix(tuple(dates))),
+        ('finra.series', lambda: warm.matrix(dates), lambda m: [m.series(t) for t in tickers]),
+        ('finra.panel', lambda: warm.matrix(dates), lambda m: short_ratio_panel(m, tickers)),
+        ('finra.screener', lambda: warm, lambda store: screen_short_volume(store, dates, top_n=50)),
+        ('vwap.cold', fresh_engine, lambda engine: engine.refresh(tickers, anchor)),
+        ('vwap.warm_incremental', warm_engine, lambda engine: engine.refresh(tickers, anchor)),
+        *[(f"replica.{name}.finra", lambda shared=shared: cold_store(shared), lambda store: store.matrix(dates))
+          for name, shared in shared_backends.items()],
+        *[(f"replica.{name}.vwap", lambda shared=shared: fresh_engine(shared),
+           lambda engine: engine.refresh(tickers, anchor))
+          for name, shared in shared_backends.items()],
+        ('yahoo.fundamentals', lambda: None, fundamentals),
+        ('merge_scoring', lambda: [r for r in vwap_results if r],
+         lambda rows: data_service.build_results(rows, short_results)),
+        ('charts.dashboard', lambda: df_results,
+         lambda df: [charts.total_score(df), charts.scatter_performance(df)]),
+        ('charts.short_basic', lambda: df_results,
+         lambda df: [build(df) for build in (charts.short_float, charts.days_to_cover, charts.shares_short,
+                                             charts.short_change, charts.finra_daily, charts.finra_10d_vs_latest)]),
+        ('charts.timeseries', lambda: short_ratio_panel(matrix, ts_tickers), timeseries_charts),
+        ('charts.advanced', lambda: df_results,
+         lambda df: [charts.yf_vs_finra(df), charts.comprehensive_score(df, short_pressure_scores(df)['Total_Score'])]),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--fixtures', default=FIXTURE_DIR)
+    parser.add_argument('--record', nargs='+', metavar='TICKER', help='실제 응답을 픽스처로 기록 후 종료')
+    parser.add_argument('--days', type=int, default=60)
+    parser.add_argument('--json', help='결과를 JSON 파일로 저장')
+    args = parser.parse_args()
+
+    if args.record:
+        manifest = record_fixtures(args.record, days=args.days, root=args.fixtures)
+        print(f"기록 완료: FINRA {len(manifest['dates'])}일, 종목 {len(manifest['tickers'])}개 → {args.fixtures}")
+        return
+
+    manifest = load_manifest(args.fixtures)
+    if manifest is None:
+        print(f"픽스처 없음 → 가상 데이터 생성 중 ({args.fixtures})")
+        manifest = synthesize_fixtures(n_tickers=max(args.sizes), days=args.days, root=args.fixtures)
+
+    replay = ReplayYahoo(args.fixtures)
+    price_data.yf = replay
+    print(f"픽스처: {manifest['source']}, FINRA {len(manifest['dates'])}일, 종목 {len(manifest['tickers'])}개\n")
+    print(f"{'종목수':>6} {'단계':<24} {'지연(ms)':>10} {'최대메모리(MB)':>15}")
+    print("-" * 60)
+
+    report = []
+    with FixtureServer(args.fixtures) as server, tempfile.TemporaryDirectory() as archive_root:
+        for n in args.sizes:
+            if n > len(manifest['tickers']):
+                print(f"{n:>6} 건너뜀 (픽스처 종목 {len(manifest['tickers'])}개)")
+                continue
+            tickers = tuple(manifest['tickers'][:n])
+            for name, setup, run in pipeline_stages(manifest, server, replay, tickers, archive_root):
+                elapsed, peak = measure(setup, run)
+                report.append({'tickers': n, 'stage': name, 'seconds': elapsed, 'peak_bytes': peak})
+                print(f"{n:>6} {name:<24} {elapsed * 1000:>10.1f} {peak / 2**20:>15.1f}")
+            print()
+        print(f"FINRA 요청 {server.requests}회, Yahoo download {replay.calls['download']}회 / info {replay.calls['info']}회")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'fixtures': manifest['source'], 'results': report}, f, indent=2)
+        print(f"저장: {args.json}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""행 단위(df.apply) 점수 계산과 벡터화 점수 계산의 속도 비교 (결과 일치는 tests/test_scoring.py에서 확인)
+
+실행: python benchmarks/bench_scoring.py [종목수 ...]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scoring import buy_scores, calculate_buy_score, calculate_short_score, short_scores
+
+DEFAULT_SIZES = [9, 100, 1000, 10000, 50000]
+
+
+def make_universe(n, seed=0):
+    # 경계값(0, 5, 10, 60, 80, 1.0, 1.2 등)과 결측치를 섞은 가상 종목 데이터
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'Is_Above_VWAP': rng.random(n) > 0.5,
+        'Price_vs_VWAP_%': rng.choice([-3.0, 0.0, 2.5, 5.0, 7.5, 10.0, 15.0], n) + rng.choice([0, 0.01], n),
+        'Above_VWAP_Days_%': rng.choice([40.0, 60.0, 70.0, 80.0, 95.0], n),
+        'Uptrend_Strength_%': rng.choice([30.0, 50.0, 55.0, 60.0, 75.0], n),
+        'Volume_Ratio': rng.choice([0.8, 1.0, 1.1, 1.2, 1.5], n),
+        'short_percent_float': rng.choice([0.5, 5.0, 7.0, 10.0, 15.0, 20.0, 35.0, np.nan], n),
+    })
+    df.loc[df.sample(frac=0.05, random_state=seed).index, 'Price_vs_VWAP_%'] = np.nan
+    return df
+
+
+def timed(func, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(sizes):
+    print(f"{'종목수':>8} | {'apply(ms)':>10} | {'vectorized(ms)':>14} | {'배속':>7}")
+    print('-' * 50)
+    for n in sizes:
+        df = make_universe(n)
+        row_time, _ = timed(lambda: (df.apply(calculate_buy_score, axis=1),
+                                     df.apply(calculate_short_score, axis=1)), repeat=1 if n > 10000 else 3)
+        vec_time, _ = timed(lambda: (buy_scores(df), short_scores(df)))
+
+        print(f"{n:>8} | {row_time * 1000:>10.2f} | {vec_time * 1000:>14.2f} | {row_time / vec_time:>6.0f}x")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
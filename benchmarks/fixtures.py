@@ -0,0 +1,228 @@
+"""벤치마크용 FINRA/Yahoo 픽스처 기록·생성·재생
+
+- record_fixtures: 실제 FINRA 일별 파일과 Yahoo 가격/.info를 받아 benchmarks/fixtures/ 에 저장
+- synthesize_fixtures: 네트워크 없이 같은 형식의 결정적(seed 고정) 가상 데이터 생성
+- FixtureServer: 저장된 FINRA 파일을 CDN과 같은 경로로 제공하는 로컬 HTTP 서버
+- ReplayYahoo: yfinance 대신 저장된 응답을 돌려주는 대역 (download, Ticker(...).info)
+- LocalRedis: 공유 캐시 Redis 백엔드 검증용 redis-py 클라이언트 대역 (get / set(ex=) / delete / scan_iter)
+"""
+import fnmatch
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from market_calendar import MARKET_TZ, published_trading_days
+from price_data import FUNDAMENTAL_FIELDS, PRICE_FIELDS
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+FINRA_FILE = "CNMSshvol{date}.txt"
+
+# 가상 픽스처 기준 시각 (고정해야 실행마다 같은 날짜 구성)
+SYNTHETIC_AS_OF = datetime(2025, 6, 30, 20, 0, tzinfo=MARKET_TZ)
+MAG7_PLUS_2 = ['AAPL', 'MSFT', 'GOOGL', 'AMZN', 'NVDA', 'META', 'TSLA', 'COIN', 'IBIT']
+
+
+def _paths(root):
+    return {
+        'manifest': os.path.join(root, 'manifest.json'),
+        'finra': os.path.join(root, 'finra'),
+        'prices': os.path.join(root, 'yahoo_prices.parquet'),
+        'info': os.path.join(root, 'yahoo_info.json'),
+    }
+
+
+def load_manifest(root=FIXTURE_DIR):
+    path = _paths(root)['manifest']
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def _write_manifest(root, source, dates, tickers, quarter_start):
+    with open(_paths(root)['manifest'], 'w') as f:
+        json.dump({'source': source, 'dates': dates, 'tickers': tickers, 'quarter_start': quarter_start}, f, indent=2)
+
+
+def _long_prices(panel):
+    # (필드, 티커) wide 패널 → parquet 저장용 long 형식 (빈 봉 포함)
+    # stack(future_stack=...)은 pandas 2.1+에서만 받으므로 requirements의 pandas>=2.0 전 범위에서 같은 결과가 나오도록 종목별로 이어 붙임
+    frames = {ticker: panel.xs(ticker, axis=1, level=1) for ticker in panel.columns.unique(level=1)}
+    long = pd.concat(frames, names=['Ticker', 'Date']).reset_index()
+    long = long[['Date', 'Ticker'] + [c for c in long.columns if c not in ('Date', 'Ticker')]]
+    return long.sort_values(['Date', 'Ticker'], ignore_index=True)
+
+
+def record_fixtures(tickers, days=60, root=FIXTURE_DIR):
+    """실제 데이터를 받아 픽스처로 저장 (네트워크 필요)"""
+    import yfinance as yf
+
+    from http_fetch import FetchEngine
+    from finra_data import FINRA_DAILY_URL
+    from price_data import load_price_panel
+
+    paths = _paths(root)
+    os.makedirs(paths['finra'], exist_ok=True)
+    dates = published_trading_days(days)
+    engine = FetchEngine()
+    results = engine.fetch_many([FINRA_DAILY_URL.format(date=d) for d in dates])
+    recorded = []
+    for d in dates:
+        result = results[FINRA_DAILY_URL.format(date=d)]
+        if result.ok:
+            with open(os.path.join(paths['finra'], FINRA_FILE.format(date=d)), 'wb') as f:
+                f.write(result.content)
+            recorded.append(d)
+
+    quarter_start = pd.Timestamp(datetime.now()).to_period('Q').start_time
+    _long_prices(load_price_panel(tickers, quarter_start)).to_parquet(paths['prices'])
+    info = {t: {k: v for k, v in yf.Ticker(t).info.items() if k in FUNDAMENTAL_FIELDS} for t in tickers}
+    with open(paths['info'], 'w') as f:
+        json.dump(info, f)
+    _write_manifest(root, 'recorded', recorded, list(tickers), quarter_start.strftime('%Y-%m-%d'))
+    return load_manifest(root)
+
+
+def synthesize_fixtures(n_symbols=12000, n_tickers=1000, days=60, root=FIXTURE_DIR, seed=0):
+    """실제 파일과 같은 형식의 가상 FINRA 파일/Yahoo 응답 생성"""
+    rng = np.random.default_rng(seed)
+    paths = _paths(root)
+    os.makedirs(paths['finra'], exist_ok=True)
+
+    symbols = MAG7_PLUS_2 + [f"S{i:05d}" for i in range(n_symbols - len(MAG7_PLUS_2))]
+    dates = published_trading_days(days, now=SYNTHETIC_AS_OF)
+    for d in dates:
+        total = rng.integers(1_000, 50_000_000, len(symbols))
+        short = (total * rng.uniform(0.2, 0.7, len(symbols))).astype('int64')
+        frame = pd.DataFrame({
+            'Date': d, 'Symbol': symbols, 'ShortVolume': short,
+            'ShortExemptVolume': (short * 0.01).astype('int64'), 'TotalVolume': total, 'Market': 'B,Q,N',
+        })
+        text = frame.to_csv(sep='|', index=False) + f"{len(frame)}\n"
+        with open(os.path.join(paths['finra'], FINRA_FILE.format(date=d)), 'w') as f:
+            f.write(text)
+
+    tickers = symbols[:n_tickers]
+    quarter_start = pd.Timestamp('2025-04-01')
+    index = pd.bdate_range(quarter_start, SYNTHETIC_AS_OF.date(), name='Date')
+    close = 100 + np.cumsum(rng.normal(0, 1, (len(index), len(tickers))), axis=0)
+    volume = rng.integers(1_000_000, 50_000_000, (len(index), len(tickers))).astype('float64')
+    panel = pd.concat({
+        'Open': pd.DataFrame(close, index=index, columns=tickers),
+        'High': pd.DataFrame(close + 1, index=index, columns=tickers),
+        'Low': pd.DataFrame(close - 1, index=index, columns=tickers),
+        'Close': pd.DataFrame(close, index=index, columns=tickers),
+        'Volume': pd.DataFrame(volume, index=index, columns=tickers),
+    }, axis=1)
+    _long_prices(panel).to_parquet(paths['prices'])
+
+    info = {t: {'marketCap': float(rng.uniform(1e9, 3e12)), 'shortRatio': float(rng.uniform(0.5, 5)),
+                'shortPercentOfFloat': float(rng.uniform(0.005, 0.2)), 'sharesShort': float(rng.uniform(1e6, 2e8)),
+                'sharesShortPriorMonth': float(rng.uniform(1e6, 2e8))} for t in tickers}
+    with open(paths['info'], 'w') as f:
+        json.dump(info, f)
+    _write_manifest(root, 'synthetic', dates, tickers, quarter_start.strftime('%Y-%m-%d'))
+    return load_manifest(root)
+
+
+class FixtureServer:
+    """benchmarks/fixtures/finra 를 CDN 경로 형식으로 제공 (없는 날짜는 404)"""
+
+    def __init__(self, root=FIXTURE_DIR):
+        handler = partial(_QuietHandler, directory=_paths(root)['finra'])
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        self.url_template = f"http://127.0.0.1:{self.server.server_address[1]}/{FINRA_FILE}"
+        self.requests = 0
+        self.server.fixture = self
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def do_GET(self):
+        self.server.fixture.requests += 1
+        super().do_GET()
+
+    def log_message(self, *args):
+        pass
+
+
+class ReplayYahoo:
+    """yfinance 모듈 대역: 저장된 가격 패널과 .info를 돌려줌"""
+
+    def __init__(self, root=FIXTURE_DIR):
+        paths = _paths(root)
+        long = pd.read_parquet(paths['prices'])
+        self.panel = long.pivot(index='Date', columns='Ticker', values=PRICE_FIELDS)
+        with open(paths['info']) as f:
+            self.info = json.load(f)
+        self.calls = {'download': 0, 'info': 0}
+
+    def download(self, tickers, start=None, end=None, **kwargs):
+        self.calls['download'] += 1
+        tickers = [tickers] if isinstance(tickers, str) else list(tickers)
+        panel = self.panel.loc[:, self.panel.columns.get_level_values(1).isin(tickers)]
+        if start is not None:
+            panel = panel[panel.index >= pd.Timestamp(start)]
+        if end is not None:
+            panel = panel[panel.index < pd.Timestamp(end)]
+        return panel.copy()
+
+    def Ticker(self, ticker):
+        replay = self
+
+        class _Ticker:
+            @property
+            def info(self):
+                replay.calls['info'] += 1
+                return dict(replay.info.get(ticker, {}))
+
+        return _Ticker()
+
+
+class LocalRedis:
+    """프로세스 내 dict로 동작하는 redis-py 클라이언트 대역 (값은 bytes, ex초 후 만료)"""
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+        self.calls = {'get': 0, 'set': 0}
+
+    def get(self, name):
+        with self._lock:
+            self.calls['get'] += 1
+            value, expires_at = self._data.get(name, (None, None))
+            if expires_at is not None and expires_at <= time.monotonic():
+                self._data.pop(name, None)
+                return None
+            return value
+
+    def set(self, name, value, ex=None):
+        with self._lock:
+            self.calls['set'] += 1
+            self._data[name] = (bytes(value), time.monotonic() + ex if ex else None)
+        return True
+
+    def delete(self, *names):
+        with self._lock:
+            return sum(self._data.pop(name, None) is not None for name in names)
+
+    def scan_iter(self, match='*'):
+        with self._lock:
+            return [name for name in self._data if fnmatch.fnmatchcase(name, match)]
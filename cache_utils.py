@@ -0,0 +1,310 @@
+import functools
+import inspect
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from perf_trace import span, tracer
+
+# ==================== 실패 결과(negative) 캐시 ====================
+class NegativeCache:
+    """실패한 URL/티커를 잠시 기억해 같은 타임아웃을 매 실행마다 반복하지 않도록 함
+
+    연속 실패할수록 재확인 간격을 ttl → 2×ttl → ... → max_ttl 로 늘림
+    """
+
+    def __init__(self, ttl=900, max_ttl=6 * 3600, name=None):
+        self.ttl = ttl
+        self.max_ttl = max_ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.skipped = 0
+        if name:
+            tracer.register_counters('negative_cache', name, self.stats, totals=('skipped',))
+
+    def is_known_miss(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False
+            if time.monotonic() >= entry['retry_at']:
+                return False
+            self.skipped += 1
+            return True
+
+    def record_miss(self, key, error=None):
+        with self._lock:
+            entry = self._entries.get(key, {'misses': 0})
+            entry['misses'] += 1
+            entry['error'] = repr(error) if error is not None else None
+            entry['retry_at'] = time.monotonic() + min(self.max_ttl, self.ttl * 2 ** (entry['misses'] - 1))
+            self._entries[key] = entry
+
+    def record_hit(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def forget(self, keys=None):
+        with self._lock:
+            if keys is None:
+                self._entries.clear()
+            for key in keys or []:
+                self._entries.pop(key, None)
+
+    def stats(self):
+        with self._lock:
+            now = time.monotonic()
+            return {
+                'entries': len(self._entries),
+                'misses': sum(e['misses'] for e in self._entries.values()),
+                'skipped': self.skipped,
+                'keys': {k: {'misses': e['misses'], 'retry_in_s': max(0, round(e['retry_at'] - now)), 'error': e['error']}
+                         for k, e in self._entries.items()},
+            }
+
+
+# ==================== 동시 요청 병합 (single-flight) ====================
+class _Flight:
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """같은 자원(키)을 여러 세션이 동시에 요청하면 먼저 온 호출만 실제로 수행하고
+    나머지는 그 결과를 기다려 공유 (캐시 만료 직후 몰리는 중복 업스트림 요청 방지)
+
+    결과는 완료 즉시 잊으므로 캐시가 아니라 "진행 중인 요청"만 병합함
+    공유된 결과는 여러 호출자가 함께 보므로 읽기 전용으로 다룰 것
+    """
+
+    def __init__(self, name=None):
+        self._flights = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.shared = 0
+        if name:
+            tracer.register_counters('singleflight', name, self.stats, totals=('leaders', 'shared'))
+
+    def _claim(self, keys):
+        owned, waiting = {}, {}
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                flight = self._flights.get(key)
+                if flight is None:
+                    flight = self._flights[key] = _Flight()
+                    owned[key] = flight
+                    self.leaders += 1
+                else:
+                    waiting[key] = flight
+                    self.shared += 1
+        return owned, waiting
+
+    def _land(self, owned, results=None, error=None):
+        with self._lock:
+            for key, flight in owned.items():
+                if error is not None:
+                    flight.error = error
+                else:
+                    flight.result = (results or {}).get(key)
+                self._flights.pop(key, None)
+                flight.done.set()
+
+    def do(self, key, fn):
+        """fn()을 키당 한 번만 실행. 대기한 호출자도 같은 결과(또는 같은 예외)를 받음"""
+        return self.do_many([key], lambda keys: {key: fn()})[key]
+
+    def do_many(self, keys, fetch_many):
+        """진행 중이 아닌 키만 모아 fetch_many(keys) → {key: 결과} 한 번으로 수행하고,
+        다른 호출자가 이미 받고 있는 키는 그 완료를 기다려 결과를 합쳐 반환"""
+        owned, waiting = self._claim(keys)
+        results = {}
+        if owned:
+            try:
+                results = fetch_many(list(owned)) or {}
+            except BaseException as e:
+                self._land(owned, error=e)
+                raise
+            self._land(owned, results)
+        if waiting:
+            # 성능 패널에서 병합된 요청 수(hits)와 대기 시간을 확인
+            with span('singleflight.wait') as trace:
+                trace.add(hits=len(waiting))
+                for key, flight in waiting.items():
+                    flight.done.wait()
+                    if flight.error is not None:
+                        raise flight.error
+                    results[key] = flight.result
+        return {key: results.get(key) for key in dict.fromkeys(keys)}
+
+    def in_flight(self):
+        with self._lock:
+            return list(self._flights)
+
+    def stats(self):
+        with self._lock:
+            return {'in_flight': len(self._flights), 'leaders': self.leaders, 'shared': self.shared}
+
+
+# ==================== 크기 기준 LRU 캐시 ====================
+def estimate_bytes(obj):
+    """캐시 항목의 대략적인 메모리 크기 (DataFrame/ndarray는 버퍼 크기, 컨테이너는 재귀 합)"""
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(index=True, deep=True).sum())
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return int(obj.memory_usage(deep=True))
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if hasattr(obj, 'to_plotly_json'):
+        # Plotly Figure: trace 데이터 배열이 대부분
+        return estimate_bytes(obj.to_plotly_json())
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(estimate_bytes(k) + estimate_bytes(v) for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return sys.getsizeof(obj) + sum(estimate_bytes(item) for item in obj)
+    return sys.getsizeof(obj)
+
+
+_MISSING = object()
+
+
+class SizedLRUCache:
+    """항목 바이트 크기를 재서 max_bytes(선택적으로 max_entries)를 넘으면 가장 오래 안 쓴 항목부터 제거
+
+    name을 주면 성능 패널/Prometheus에 적중·미스·제거·상주 바이트를 노출
+    max_bytes보다 큰 단일 항목은 보관하지 않음 (계산 결과는 그대로 반환)
+    """
+
+    def __init__(self, name=None, max_bytes=256 * 2**20, max_entries=None, sizeof=estimate_bytes):
+        self.name = name
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.sizeof = sizeof
+        self._entries = OrderedDict()  # key → (값, 바이트, 만료 시각)
+        self._lock = threading.Lock()
+        self._flights = SingleFlight()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if name:
+            tracer.register_cache(name, self.stats)
+
+    def _peek(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return _MISSING
+        if entry[2] is not None and entry[2] <= time.monotonic():
+            self._remove(key)
+            return _MISSING
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def get(self, key, default=None):
+        with self._lock:
+            value = self._peek(key)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self.hits += 1
+            return value
+
+    def put(self, key, value, ttl=None):
+        size = self.sizeof(value)
+        with self._lock:
+            self._remove(key)
+            if size > self.max_bytes:
+                self.evictions += 1
+                return value
+            self._entries[key] = (value, size, time.monotonic() + ttl if ttl else None)
+            self.bytes += size
+            while self._entries and (self.bytes > self.max_bytes
+                                     or (self.max_entries and len(self._entries) > self.max_entries)):
+                _, (_, evicted, _) = self._entries.popitem(last=False)
+                self.bytes -= evicted
+                self.evictions += 1
+        return value
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry[1]
+
+    def pop(self, key):
+        with self._lock:
+            self._remove(key)
+
+    def clear(self, predicate=None):
+        """predicate(key)가 참인 항목만 (없으면 전부) 제거"""
+        with self._lock:
+            for key in [k for k in self._entries if predicate is None or predicate(k)]:
+                self._remove(key)
+
+    def keys(self):
+        with self._lock:
+            return list(self._entries)
+
+    def __contains__(self, key):
+        with self._lock:
+            return self._peek(key) is not _MISSING
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'bytes': self.bytes, 'max_bytes': self.max_bytes,
+                    'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
+
+    def memoize(self, ttl=None):
+        """함수 결과를 이 캐시에 보관하는 데코레이터 (st.cache_data 대신 크기 상한 아래에서 사용)
+
+        키는 (함수 이름, 기본값을 채운 인자). 예외와 None(수집 실패)은 저장하지 않고
+        (재시도 시점은 negative 캐시가 결정), 같은 키의 동시 미스는 한 번만 계산
+        반환값은 복사 없이 공유되므로 호출 측에서 수정하지 말 것
+        .clear(*args, **kwargs)는 해당 인자 항목만, .clear()는 이 함수의 항목 전체 제거
+        """
+        def decorate(func):
+            signature = inspect.signature(func)
+            func_name = f"{func.__module__}.{func.__qualname__}"
+
+            def make_key(args, kwargs):
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                return (func_name, tuple(bound.arguments.items()))
+
+            def compute(key, args, kwargs):
+                with self._lock:
+                    # 대기하는 동안 다른 호출이 채웠으면 그 값 사용
+                    value = self._peek(key)
+                if value is not _MISSING:
+                    return value
+                value = func(*args, **kwargs)
+                if value is None:
+                    return None
+                return self.put(key, value, ttl)
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                key = make_key(args, kwargs)
+                value = self.get(key, _MISSING)
+                if value is not _MISSING:
+                    return value
+                return self._flights.do(key, lambda: compute(key, args, kwargs))
+
+            def clear(*args, **kwargs):
+                if args or kwargs:
+                    self.pop(make_key(args, kwargs))
+                else:
+                    self.clear(lambda key: key[0] == func_name)
+
+            wrapper.clear = clear
+            return wrapper
+        return decorate
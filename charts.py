@@ -0,0 +1,400 @@
+import plotly.express as px
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+# ==================== Plotly 차트 ====================
+# 탭 렌더링과 분리된 Figure 생성 함수 (Streamlit 의존 없음)
+# 입력 데이터만으로 Figure를 만들어 figure_cache 키(입력 내용 해시)와 벤치마크가 같은 함수를 사용
+
+# 시계열 탭 종목별 색상
+TIMESERIES_COLORS = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#FFA07A', '#98D8C8', '#F7DC6F', '#BB8FCE', '#E74C3C', '#3498DB']
+
+
+def total_score(df_results):
+    """종합 대시보드: 기술적 점수 / 종합 투자 점수 가로 막대"""
+    fig_total_score = make_subplots(
+        rows=1, cols=2,
+        subplot_titles=('기술적 분석 점수', '종합 투자 점수 (기술적 + 공매도)'),
+        specs=[[{"type": "bar"}, {"type": "bar"}]]
+    )
+
+    fig_total_score.add_trace(
+        go.Bar(
+            y=df_results['Ticker'],
+            x=df_results['Buy_Signal_Score'],
+            orientation='h',
+            name='기술적 점수',
+            marker_color='#2196F3',
+            text=df_results['Buy_Signal_Score'],
+            textposition='auto',
+            hovertemplate='<b>%{y}</b><br>기술적 점수: %{x}/100<extra></extra>'
+        ),
+        row=1, col=1
+    )
+
+    fig_total_score.add_trace(
+        go.Bar(
+            y=df_results['Ticker'],
+            x=df_results['Total_Investment_Score'],
+            orientation='h',
+            name='종합 점수',
+            marker_color='#4CAF50',
+            text=df_results['Total_Investment_Score'],
+            textposition='auto',
+            hovertemplate='<b>%{y}</b><br>종합 점수: %{x}/120<extra></extra>'
+        ),
+        row=1, col=2
+    )
+
+    fig_total_score.update_xaxes(title_text="점수", row=1, col=1)
+    fig_total_score.update_xaxes(title_text="점수", row=1, col=2)
+    fig_total_score.update_yaxes(title_text="종목", row=1, col=1)
+
+    fig_total_score.update_layout(
+        height=500,
+        showlegend=False,
+        template='plotly_white'
+    )
+    return fig_total_score
+
+
+def scatter_performance(df_results):
+    """종합 대시보드: 공매도 비율 vs 분기 수익률 (버블 = 시가총액)"""
+    fig_scatter_performance = px.scatter(
+        df_results,
+        x='short_percent_float',
+        y='Quarter_Return_%',
+        size='Market_Cap_Trillion',
+        color='Total_Investment_Score',
+        hover_data=['Ticker', 'Company'],
+        text='Ticker',
+        color_continuous_scale='RdYlGn',
+        labels={
+            'short_percent_float': '공매도 비율 (%)',
+            'Quarter_Return_%': '분기 수익률 (%)',
+            'Total_Investment_Score': '종합 점수'
+        }
+    )
+
+    fig_scatter_performance.update_traces(textposition='top center', textfont_size=12)
+    fig_scatter_performance.update_layout(height=500)
+    return fig_scatter_performance
+
+
+def short_float(df_results):
+    """공매도 기본: YF Short % of Float"""
+    fig_a = go.Figure()
+    colors = ['green' if x < 2 else 'orange' if x < 5 else 'red' for x in df_results['short_percent_float']]
+    fig_a.add_trace(go.Bar(
+        x=df_results['Ticker'], 
+        y=df_results['short_percent_float'],
+        marker=dict(color=colors), 
+        text=df_results['short_percent_float'].round(2),
+        textposition='auto',
+        hovertemplate='<b>%{x}</b><br>공매도 비율: %{y:.2f}%<extra></extra>'
+    ))
+    fig_a.add_hline(y=2, line_dash="dash", line_color="green", annotation_text="매우 건강 (2%)")
+    fig_a.add_hline(y=5, line_dash="dash", line_color="orange", annotation_text="건강 (5%)")
+    fig_a.update_layout(height=400, template='plotly_white', showlegend=False)
+    return fig_a
+
+
+def days_to_cover(df_results):
+    """공매도 기본: Days to Cover"""
+    fig_b = go.Figure()
+    colors_days = ['green' if x < 2 else 'orange' if x < 3 else 'red' for x in df_results['short_ratio_days']]
+    fig_b.add_trace(go.Bar(
+        x=df_results['Ticker'], 
+        y=df_results['short_ratio_days'],
+        marker=dict(color=colors_days), 
+        text=df_results['short_ratio_days'].round(2),
+        textposition='auto',
+        hovertemplate='<b>%{x}</b><br>청산 소요일: %{y:.2f}일<extra></extra>'
+    ))
+    fig_b.add_hline(y=2, line_dash="dash", line_color="green", annotation_text="빠른 청산")
+    fig_b.add_hline(y=3, line_dash="dash", line_color="red", annotation_text="Squeeze 가능")
+    fig_b.update_layout(height=400, template='plotly_white', showlegend=False)
+    return fig_b
+
+
+def shares_short(df_results):
+    """공매도 기본: Shares Short (백만 주)"""
+    fig_c = go.Figure()
+    fig_c.add_trace(go.Bar(
+        x=df_results['Ticker'],
+        y=df_results['shares_short_millions'],
+        marker=dict(
+            color=df_results['shares_short_millions'],
+            colorscale='Reds',
+            showscale=True,
+            colorbar=dict(title="M")
+        ),
+        text=df_results['shares_short_millions'].round(1),
+        textposition='auto',
+        hovertemplate='<b>%{x}</b><br>공매도 주식: %{y:.1f}M<extra></extra>'
+    ))
+    fig_c.update_layout(height=400, template='plotly_white', showlegend=False)
+    return fig_c
+
+
+def short_change(df_results):
+    """공매도 기본: 전월 대비 공매도 변화율"""
+    fig_d = go.Figure()
+    colors_change = ['red' if x > 0 else 'green' for x in df_results['short_change_pct']]
+    fig_d.add_trace(go.Bar(
+        x=df_results['Ticker'], 
+        y=df_results['short_change_pct'],
+        marker=dict(color=colors_change), 
+        text=[f"{x:+.1f}%" for x in df_results['short_change_pct']],
+        textposition='auto',
+        hovertemplate='<b>%{x}</b><br>전월 대비: %{y:+.1f}%<extra></extra>'
+    ))
+    fig_d.add_hline(y=0, line_dash="solid", line_color="black", line_width=2)
+    fig_d.update_layout(height=400, template='plotly_white', showlegend=False)
+    return fig_d
+
+
+def finra_daily(df_results):
+    """공매도 기본: FINRA 최근일 공매도 비율"""
+    fig_e = go.Figure()
+    colors_finra = ['green' if x < 35 else 'orange' if x < 45 else 'red' for x in df_results['daily_short_ratio']]
+    fig_e.add_trace(go.Bar(
+        x=df_results['Ticker'], 
+        y=df_results['daily_short_ratio'],
+        marker=dict(color=colors_finra), 
+        text=df_results['daily_short_ratio'].round(1),
+        textposition='auto',
+        hovertemplate='<b>%{x}</b><br>일일 공매도: %{y:.1f}%<extra></extra>'
+    ))
+    fig_e.add_hline(y=35, line_dash="dash", line_color="green", annotation_text="낮음 (35%)")
+    fig_e.add_hline(y=45, line_dash="dash", line_color="orange", annotation_text="보통 (45%)")
+    fig_e.update_layout(height=400, template='plotly_white', showlegend=False)
+    return fig_e
+
+
+def finra_10d_vs_latest(df_results):
+    """공매도 기본: FINRA 10일 평균 vs 최근일"""
+    fig_f = go.Figure()
+
+    fig_f.add_trace(go.Bar(
+        x=df_results['Ticker'],
+        y=df_results['avg_daily_short_ratio_10d'],
+        name='10일 평균',
+        marker_color='lightblue',
+        text=df_results['avg_daily_short_ratio_10d'].round(1),
+        textposition='auto',
+        hovertemplate='<b>%{x}</b><br>10일 평균: %{y:.1f}%<extra></extra>'
+    ))
+
+    fig_f.add_trace(go.Bar(
+        x=df_results['Ticker'],
+        y=df_results['daily_short_ratio'],
+        name='최근일',
+        marker_color='darkblue',
+        text=df_results['daily_short_ratio'].round(1),
+        textposition='auto',
+        hovertemplate='<b>%{x}</b><br>최근일: %{y:.1f}%<extra></extra>'
+    ))
+
+    fig_f.update_layout(
+        height=400, 
+        template='plotly_white',
+        barmode='group',
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+    return fig_f
+
+
+def ts_all(ratio_panel):
+    """시계열: 전체 종목 공매도 비율 추세 (short_ratio_panel의 short_ratio)"""
+    fig_ts_all = go.Figure()
+
+    for idx, ticker in enumerate(ratio_panel.columns):
+        fig_ts_all.add_trace(go.Scatter(
+            x=ratio_panel.index,
+            y=ratio_panel[ticker],
+            mode='lines+markers',
+            name=ticker,
+            connectgaps=True,
+            line=dict(width=2.5, color=TIMESERIES_COLORS[idx % len(TIMESERIES_COLORS)]),
+            marker=dict(size=6),
+            hovertemplate='<b>%{fullData.name}</b><br>날짜: %{x|%Y-%m-%d}<br>공매도 비율: %{y:.1f}%<extra></extra>'
+        ))
+
+    fig_ts_all.add_hline(y=40, line_dash="dash", line_color="gray", annotation_text="정상 범위 (40%)")
+    fig_ts_all.add_hline(y=50, line_dash="dash", line_color="red", annotation_text="약세 압력 (50%)")
+
+    fig_ts_all.update_layout(
+        xaxis_title='날짜',
+        yaxis_title='공매도 거래 비율 (%)',
+        hovermode='x unified',
+        height=600,
+        template='plotly_white',
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+    return fig_ts_all
+
+
+def ts_individual(ratio_panel, ma_panel, tickers):
+    """시계열: 종목별 서브플롯 + 7일 이동평균 (tickers 순서로 3열 그리드)"""
+    n_cols = 3
+    n_rows = (len(tickers) + n_cols - 1) // n_cols
+    fig_ts_individual = make_subplots(
+        rows=n_rows, cols=n_cols,
+        subplot_titles=[ticker for ticker in tickers],
+        vertical_spacing=0.10,
+        horizontal_spacing=0.08
+    )
+
+    for idx, ticker in enumerate(tickers):
+        row = idx // n_cols + 1
+        col = idx % n_cols + 1
+
+        if ticker in ratio_panel.columns:
+            # 공매도 비율 라인
+            fig_ts_individual.add_trace(
+                go.Scatter(
+                    x=ratio_panel.index,
+                    y=ratio_panel[ticker],
+                    mode='lines',
+                    name=ticker,
+                    connectgaps=True,
+                    line=dict(width=2, color=TIMESERIES_COLORS[idx % len(TIMESERIES_COLORS)]),
+                    fill='tozeroy',
+                    fillcolor=f'rgba({int(TIMESERIES_COLORS[idx % len(TIMESERIES_COLORS)][1:3], 16)}, {int(TIMESERIES_COLORS[idx % len(TIMESERIES_COLORS)][3:5], 16)}, {int(TIMESERIES_COLORS[idx % len(TIMESERIES_COLORS)][5:7], 16)}, 0.2)',
+                    showlegend=False,
+                    hovertemplate='%{y:.1f}%<extra></extra>'
+                ),
+                row=row, col=col
+            )
+
+            # 이동평균선 (7일)
+            if ma_panel[ticker].notna().any():
+                fig_ts_individual.add_trace(
+                    go.Scatter(
+                        x=ma_panel.index,
+                        y=ma_panel[ticker],
+                        mode='lines',
+                        name=f'{ticker} MA7',
+                        connectgaps=True,
+                        line=dict(width=1.5, color='red', dash='dash'),
+                        showlegend=False,
+                        hovertemplate='MA7: %{y:.1f}%<extra></extra>'
+                    ),
+                    row=row, col=col
+                )
+
+    fig_ts_individual.update_xaxes(title_text="날짜")
+    fig_ts_individual.update_yaxes(title_text="공매도 비율 (%)")
+
+    fig_ts_individual.update_layout(
+        height=300 * n_rows,
+        template='plotly_white',
+        showlegend=False
+    )
+    return fig_ts_individual
+
+
+def volume_vs_short(df_recent):
+    """시계열: 거래량 vs 공매도 비율 (short_ratio_panel의 recent)"""
+    fig_vol_short = px.scatter(
+        df_recent,
+        x='total_volume',
+        y='short_ratio',
+        color='ticker',
+        size='short_volume',
+        hover_data=['date'],
+        labels={
+            'total_volume': '전체 거래량',
+            'short_ratio': '공매도 비율 (%)',
+            'ticker': '종목'
+        },
+        color_discrete_sequence=TIMESERIES_COLORS
+    )
+
+    fig_vol_short.update_layout(height=600, template='plotly_white')
+    return fig_vol_short
+
+
+def volatility_box(ratio_panel, tickers):
+    """시계열: 공매도 비율 변동성 Box Plot"""
+    fig_volatility = go.Figure()
+
+    for idx, ticker in enumerate(tickers):
+        if ticker in ratio_panel.columns:
+            fig_volatility.add_trace(go.Box(
+                y=ratio_panel[ticker].dropna(),
+                name=ticker,
+                marker_color=TIMESERIES_COLORS[idx % len(TIMESERIES_COLORS)],
+                boxmean='sd'
+            ))
+
+    fig_volatility.update_layout(
+        yaxis_title='공매도 비율 (%)',
+        xaxis_title='종목',
+        height=600,
+        template='plotly_white',
+        showlegend=False
+    )
+    return fig_volatility
+
+
+def yf_vs_finra(df_results):
+    """고급: YF Short % vs FINRA Daily % 상관관계"""
+    fig_correlation = go.Figure()
+
+    fig_correlation.add_trace(go.Scatter(
+        x=df_results['short_percent_float'],
+        y=df_results['daily_short_ratio'],
+        mode='markers+text',
+        text=df_results['Ticker'],
+        textposition='top center',
+        marker=dict(
+            size=df_results['shares_short_millions'] / 10,
+            color=df_results['short_change_pct'],
+            colorscale='RdYlGn_r',
+            showscale=True,
+            colorbar=dict(title="MoM<br>변화율")
+        ),
+        hovertemplate='<b>%{text}</b><br>YF Short: %{x:.2f}%<br>FINRA Daily: %{y:.1f}%<extra></extra>'
+    ))
+
+    fig_correlation.add_hline(y=40, line_dash="dash", line_color="gray", annotation_text="FINRA 정상선 (40%)")
+    fig_correlation.add_vline(x=2, line_dash="dash", line_color="gray", annotation_text="YF 매우건강 (2%)")
+    fig_correlation.add_vline(x=5, line_dash="dash", line_color="orange", annotation_text="YF 건강선 (5%)")
+
+    fig_correlation.update_layout(
+        xaxis_title='Yahoo Finance: Short % of Float',
+        yaxis_title='FINRA: Daily Short Volume %',
+        height=600,
+        template='plotly_white'
+    )
+    return fig_correlation
+
+
+def comprehensive_score(df_results, scores):
+    """고급: 공매도 종합 점수 (scores는 scoring.short_pressure_scores의 Total_Score)"""
+    fig_comprehensive = go.Figure()
+
+    colors_comp = ['green' if x > 70 else 'orange' if x > 50 else 'red' for x in scores]
+
+    fig_comprehensive.add_trace(go.Bar(
+        x=df_results['Ticker'],
+        y=scores,
+        marker=dict(color=colors_comp),
+        text=scores.round(1),
+        textposition='auto',
+        hovertemplate='<b>%{x}</b><br>종합 점수: %{y:.1f}/100<extra></extra>'
+    ))
+
+    fig_comprehensive.add_hline(y=70, line_dash="dash", line_color="green", annotation_text="우수 (70점)")
+    fig_comprehensive.add_hline(y=50, line_dash="dash", line_color="orange", annotation_text="보통 (50점)")
+
+    fig_comprehensive.update_layout(
+        xaxis_title='종목',
+        yaxis_title='종합 점수 (점)',
+        height=450,
+        template='plotly_white',
+        showlegend=False
+    )
+    return fig_comprehensive
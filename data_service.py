@@ -0,0 +1,262 @@
+"""Streamlit 없이 사용할 수 있는 데이터 수집/분석 라이브러리 + 스냅샷 CLI
+
+대시보드(mag7_dashboard_expander.py)는 이 함수들에 크기 상한 LRU 캐싱(cache_utils.SizedLRUCache)만 덧씌워 사용하고,
+cron/배치에서는 CLI로 한 프로세스 안에서 스냅샷을 계산해 Parquet/JSON으로 저장
+
+실행:
+  python data_service.py --out snapshot.parquet
+  python data_service.py AAPL MSFT NVDA --out snapshot.json --finra-history finra.parquet
+"""
+import argparse
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pandas as pd
+
+from finra_data import finra_store
+from market_calendar import published_trading_days
+from price_data import fetch_fundamentals, vwap_engine
+from scoring import buy_scores, short_scores
+
+# ==================== MAG 7+2 정의 ====================
+MAG7_STOCKS = {
+    'AAPL': {'name': 'Apple Inc.', 'description': '아이폰, 생태계, 온디바이스 AI', 'sector': 'Technology', 'industry': 'Consumer Electronics'},
+    'MSFT': {'name': 'Microsoft Corporation', 'description': '클라우드(Azure), 생성형 AI (OpenAI 대주주)', 'sector': 'Technology', 'industry': 'Software'},
+    'GOOGL': {'name': 'Alphabet Inc.', 'description': '구글 검색, 유튜브, AI (Gemini)', 'sector': 'Communication Services', 'industry': 'Internet Content & Information'},
+    'AMZN': {'name': 'Amazon.com Inc.', 'description': '전자상거래, 클라우드(AWS) 1위', 'sector': 'Consumer Cyclical', 'industry': 'Internet Retail'},
+    'NVDA': {'name': 'NVIDIA Corporation', 'description': 'AI 반도체(GPU) 독점적 지배자', 'sector': 'Technology', 'industry': 'Semiconductors'},
+    'META': {'name': 'Meta Platforms Inc.', 'description': '페이스북, 인스타그램, AI(Llama)', 'sector': 'Communication Services', 'industry': 'Internet Content & Information'},
+    'TSLA': {'name': 'Tesla Inc.', 'description': '전기차, 자율주행, 로봇', 'sector': 'Consumer Cyclical', 'industry': 'Auto Manufacturers'},
+    'COIN': {'name': 'Coinbase Global Inc.', 'description': '미국 최대 암호화폐 거래소, 비트코인 직접 노출', 'sector': 'Financial Services', 'industry': 'Cryptocurrency Exchange'},
+    'IBIT': {'name': 'iShares Bitcoin Trust ETF', 'description': 'BlackRock 비트코인 현물 ETF, 순수 BTC 노출', 'sector': 'ETF', 'industry': 'Bitcoin Spot ETF'}
+}
+
+# 공매도 시계열/종합 분석에 쓰는 FINRA 조회 기간 (거래일)
+SHORT_HISTORY_DAYS = 60
+
+
+def current_quarter_start():
+    now = datetime.now()
+    quarter = (now.month - 1) // 3
+    quarter_start_month = quarter * 3 + 1
+    return datetime(now.year, quarter_start_month, 1)
+
+
+# ==================== 공매도 데이터 ====================
+def get_finra_short_volume(ticker, days_back=10, fetch=True, include_history=True):
+    """최근 days_back 거래일 FINRA 공매도 비율 요약 (fetch=False면 이미 받아둔 날짜만 사용)
+
+    include_history=False면 historical_data를 빼고 요약값만 반환
+    (바이트 크기로 상한을 두는 결과 캐시에 담을 때. 시계열은 finra_store.matrix(...).series로 공유 행렬에서 직접 읽음)
+    """
+    try:
+        # 휴장일/미게시 파일은 요청하지 않도록 게시 완료된 최근 days_back 거래일만 조회
+        check_dates = published_trading_days(days_back)
+
+        # 날짜별 파일은 finra_store에서 한 번만 (병렬로) 다운로드/파싱하여 모든 티커가 공유하고
+        # 날짜 × 종목 배열에서 해당 종목 열만 슬라이스 (최신순)
+        return summarize_finra(ticker, finra_store.matrix(check_dates, fetch=fetch), include_history)
+    except:
+        return None
+
+def summarize_finra(ticker, matrix, include_history=True):
+    """ShortVolumeMatrix에서 한 종목의 최근일/기간 평균 공매도 비율 요약 (데이터가 없으면 None)"""
+    df_short = matrix.series(ticker).iloc[::-1].reset_index(drop=True)
+    if df_short.empty:
+        return None
+    summary = {
+        'ticker': ticker,
+        'latest_date': df_short.iloc[0]['date'],
+        'latest_short_ratio': df_short.iloc[0]['short_ratio'],
+        'avg_short_ratio_10d': round(df_short['short_ratio'].mean(), 2),
+        'data_points': len(df_short),
+    }
+    if include_history:
+        summary['historical_data'] = df_short
+    return summary
+
+def short_interest_from_snapshot(ticker, info):
+    """fetch_fundamentals 스냅샷에서 공매도 잔고 지표 계산 (스냅샷이 없으면 None)"""
+    try:
+        short_data = {
+            'ticker': ticker,
+            'short_ratio': info.get('shortRatio', 0),
+            'short_percent_float': info.get('shortPercentOfFloat', 0) * 100 if info.get('shortPercentOfFloat') else 0,
+            'shares_short': info.get('sharesShort', 0),
+            'shares_short_prior_month': info.get('sharesShortPriorMonth', 0),
+            'fetched_at': info['fetched_at'],
+        }
+
+        if short_data['shares_short_prior_month'] > 0:
+            short_data['short_change_pct'] = ((short_data['shares_short'] - short_data['shares_short_prior_month']) /
+                                               short_data['shares_short_prior_month'] * 100)
+        else:
+            short_data['short_change_pct'] = 0
+        return short_data
+    except:
+        return None
+
+def combine_short_data(ticker, yf_data, finra_data):
+    combined_data = {
+        'ticker': ticker, 'short_ratio_days': 0, 'short_percent_float': 0,
+        'shares_short_millions': 0, 'short_change_pct': 0, 'daily_short_ratio': 0,
+        'avg_daily_short_ratio_10d': 0, 'finra_latest_date': 'N/A',
+        'fundamentals_as_of': 'N/A', 'data_source': []
+    }
+
+    if yf_data:
+        combined_data.update({
+            'short_ratio_days': round(yf_data.get('short_ratio', 0), 2),
+            'short_percent_float': round(yf_data.get('short_percent_float', 0), 2),
+            'shares_short_millions': round(yf_data.get('shares_short', 0) / 1e6, 2),
+            'short_change_pct': round(yf_data.get('short_change_pct', 0), 2),
+            'fundamentals_as_of': yf_data['fetched_at'].strftime('%Y-%m-%d %H:%M'),
+        })
+        combined_data['data_source'].append('Yahoo Finance')
+
+    if finra_data:
+        combined_data['daily_short_ratio'] = finra_data['latest_short_ratio']
+        combined_data['avg_daily_short_ratio_10d'] = finra_data['avg_short_ratio_10d']
+        combined_data['finra_latest_date'] = finra_data.get('latest_date', 'N/A')
+        combined_data['data_source'].append(f"FINRA ({finra_data.get('data_points', 0)}일)")
+
+    combined_data['data_source'] = ' + '.join(combined_data['data_source']) if combined_data['data_source'] else 'N/A'
+    return combined_data
+
+def get_comprehensive_short_data(ticker, fundamentals=None, days_back=SHORT_HISTORY_DAYS, fetch=True):
+    """Yahoo 공매도 잔고 + FINRA 일별 공매도 비율 (fundamentals를 주지 않으면 .info 조회)"""
+    if fundamentals is None and fetch:
+        fundamentals = fetch_fundamentals(ticker)
+    yf_data = short_interest_from_snapshot(ticker, fundamentals) if fundamentals else None
+    finra_data = get_finra_short_volume(ticker, days_back=days_back, fetch=fetch)
+    return combine_short_data(ticker, yf_data, finra_data)
+
+
+# ==================== 분기 Anchored VWAP 분석 ====================
+def summarize_vwap(ticker, df, info):
+    """앵커 VWAP 프레임 → 종목 요약 지표 (봉이 5개 미만이면 None)"""
+    if df.empty or len(df) < 5:
+        return None
+
+    current_price = df['Close'].iloc[-1]
+    current_vwap = df['Anchored_VWAP'].iloc[-1]
+    above_vwap_ratio = (df['Close'] > df['Anchored_VWAP']).sum() / len(df) * 100
+
+    recent_20 = df['Close'].tail(min(20, len(df)))
+    uptrend_strength = (recent_20.diff() > 0).sum() / len(recent_20) * 100 if len(recent_20) > 1 else 50
+
+    recent_volume = df['Volume'].tail(5).mean()
+    avg_volume = df['Volume'].mean()
+    volume_ratio = recent_volume / avg_volume if avg_volume > 0 else 1
+
+    quarter_start_price = df['Close'].iloc[0]
+    quarter_return = ((current_price - quarter_start_price) / quarter_start_price * 100)
+    meta = MAG7_STOCKS.get(ticker, {})
+
+    return {
+        'Ticker': ticker, 'Company': meta.get('name', ticker),
+        'Description': meta.get('description', ''),
+        'Current_Price': round(current_price, 2),
+        'Anchored_VWAP': round(current_vwap, 2),
+        'Quarter_Return_%': round(quarter_return, 2),
+        'Price_vs_VWAP_%': round((current_price - current_vwap) / current_vwap * 100, 2),
+        'Above_VWAP_Days_%': round(above_vwap_ratio, 1),
+        'Uptrend_Strength_%': round(uptrend_strength, 1),
+        'Volume_Ratio': round(volume_ratio, 2),
+        'Is_Above_VWAP': current_price > current_vwap,
+        'Market_Cap': info.get('marketCap') or 0,
+    }
+
+def get_quarterly_vwap_analysis(ticker, universe=None, anchor=None, fundamentals=None, fetch=True):
+    """분기 시작 앵커 VWAP 분석
+
+    fetch=True면 universe 전체를 한 번의 배치로 증분 갱신, False면 이미 누적된 프레임만 사용
+    """
+    try:
+        anchor = anchor or current_quarter_start()
+        if fetch:
+            # 분기 시작 앵커 VWAP 누적기에 마지막 봉 이후 구간만 배치로 추가
+            frames = vwap_engine.refresh(tuple(sorted(universe or [ticker])), anchor)
+        else:
+            frames = vwap_engine.frames([ticker], anchor)
+        if fundamentals is None and fetch:
+            fundamentals = fetch_fundamentals(ticker)
+        return summarize_vwap(ticker, frames[ticker], fundamentals or {})
+    except Exception as e:
+        return None
+
+
+# ==================== 종합 결과 ====================
+def build_results(vwap_results, short_results):
+    """VWAP 분석 + 공매도 분석 병합 후 점수 계산, 종합 점수 순으로 정렬"""
+    df_results = pd.DataFrame(vwap_results)
+    if df_results.empty:
+        return df_results
+    df_short = pd.DataFrame(short_results)
+    if not df_short.empty:
+        df_results = df_results.merge(df_short, left_on='Ticker', right_on='ticker', how='left')
+    df_results['Market_Cap_Trillion'] = (df_results['Market_Cap'] / 1e12).round(3)
+
+    df_results['Buy_Signal_Score'] = buy_scores(df_results)
+    df_results['Short_Score'] = short_scores(df_results)
+    df_results['Total_Investment_Score'] = df_results['Buy_Signal_Score'] + df_results['Short_Score']
+    return df_results.sort_values('Total_Investment_Score', ascending=False)
+
+def build_snapshot(tickers, anchor=None, days_back=SHORT_HISTORY_DAYS, max_workers=18):
+    """가격(배치 1회), FINRA 파일, 펀더멘털을 병렬로 모은 뒤 대시보드와 같은 종합 결과 DataFrame 생성"""
+    tickers = list(dict.fromkeys(t.upper() for t in tickers))
+    anchor = anchor or current_quarter_start()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        prices = executor.submit(vwap_engine.refresh, tuple(sorted(tickers)), anchor)
+        finra = executor.submit(finra_store.prefetch, published_trading_days(days_back))
+        fundamentals = dict(zip(tickers, executor.map(fetch_fundamentals, tickers)))
+        prices.result()
+        finra.result()
+
+    vwap_results = [
+        get_quarterly_vwap_analysis(t, anchor=anchor, fundamentals=fundamentals[t] or {}, fetch=False)
+        for t in tickers
+    ]
+    short_results = [
+        get_comprehensive_short_data(t, fundamentals=fundamentals[t] or {}, days_back=days_back, fetch=False)
+        for t in tickers
+    ]
+    return build_results([r for r in vwap_results if r], short_results)
+
+def finra_history(tickers, days_back=SHORT_HISTORY_DAYS):
+    """종목별 FINRA 일별 공매도 시계열을 long 형식으로 (date, Ticker, short_volume, total_volume, short_ratio)"""
+    matrix = finra_store.matrix(published_trading_days(days_back))
+    frames = [matrix.series(t).assign(Ticker=t) for t in tickers if t in matrix]
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+# ==================== CLI ====================
+def write_frame(df, path):
+    if os.path.splitext(path)[1].lower() == '.json':
+        df.to_json(path, orient='records', date_format='iso', force_ascii=False, indent=2)
+    else:
+        df.to_parquet(path, index=False)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="종목 스냅샷(VWAP + 공매도 + 점수)을 계산해 Parquet/JSON으로 저장")
+    parser.add_argument('tickers', nargs='*', default=list(MAG7_STOCKS), help='기본값: MAG 7+2')
+    parser.add_argument('--out', required=True, help='.parquet 또는 .json')
+    parser.add_argument('--days', type=int, default=SHORT_HISTORY_DAYS, help='FINRA 조회 거래일 수')
+    parser.add_argument('--finra-history', help='종목별 FINRA 일별 시계열 저장 경로 (.parquet/.json)')
+    args = parser.parse_args(argv)
+
+    df_results = build_snapshot(args.tickers, days_back=args.days)
+    df_results.insert(0, 'snapshot_at', datetime.now().isoformat(timespec='seconds'))
+    write_frame(df_results, args.out)
+    print(f"{len(df_results)}개 종목 → {args.out}")
+
+    if args.finra_history:
+        history = finra_history([t.upper() for t in args.tickers], days_back=args.days)
+        write_frame(history, args.finra_history)
+        print(f"FINRA 시계열 {len(history)}행 → {args.finra_history}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from cache_utils import SizedLRUCache
+from perf_trace import span
+
+# ==================== Plotly 차트 캐시 ====================
+# 입력 데이터 내용의 해시 + 차트 옵션을 키로 완성된 Figure를 재사용
+# (체크박스 토글/화면 전환처럼 데이터가 그대로인 재실행에서 add_trace/update_layout 재구성 생략)
+
+
+def _update(digest, obj):
+    if isinstance(obj, pd.DataFrame):
+        digest.update(b'DataFrame')
+        digest.update(repr((list(obj.columns), [str(t) for t in obj.dtypes])).encode())
+        _update_pandas(digest, obj)
+    elif isinstance(obj, pd.Series):
+        digest.update(b'Series')
+        digest.update(repr((obj.name, str(obj.dtype))).encode())
+        _update_pandas(digest, obj)
+    elif isinstance(obj, np.ndarray):
+        digest.update(repr((obj.dtype.str, obj.shape)).encode())
+        digest.update(np.ascontiguousarray(obj).tobytes() if obj.dtype != object else repr(obj.tolist()).encode())
+    elif isinstance(obj, dict):
+        digest.update(b'{')
+        for key in sorted(obj, key=repr):
+            _update(digest, key)
+            _update(digest, obj[key])
+        digest.update(b'}')
+    elif isinstance(obj, (list, tuple)):
+        digest.update(b'(')
+        for item in obj:
+            _update(digest, item)
+        digest.update(b')')
+    else:
+        digest.update(repr(obj).encode())
+
+
+def _update_pandas(digest, obj):
+    try:
+        digest.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+    except TypeError:
+        # 리스트/딕셔너리처럼 해시할 수 없는 값이 든 object 컬럼
+        digest.update(obj.to_json(date_format='iso').encode())
+
+
+def content_hash(*parts):
+    """DataFrame/Series/ndarray/dict/스칼라 조합의 내용 기반 해시"""
+    digest = hashlib.blake2b(digest_size=16)
+    _update(digest, parts)
+    return digest.hexdigest()
+
+
+class FigureCache:
+    """(차트 이름, 입력 해시, 옵션)별 Figure LRU 캐시 (프로세스 단위, 세션 간 공유, 항목 수·바이트 상한)"""
+
+    def __init__(self, max_entries=128, max_bytes=64 * 2**20, name=None):
+        self._entries = SizedLRUCache(name, max_bytes=max_bytes, max_entries=max_entries)
+
+    def get_or_build(self, name, builder, *inputs, **options):
+        """builder(*inputs, **options)로 Figure 생성 (charts.py의 함수처럼 인자 외의 값에 의존하지 않아야 함)"""
+        with span(f"figure.{name}", cache='hit') as trace:
+            key = (name, content_hash(inputs, options))
+            figure = self._entries.get(key)
+            if figure is not None:
+                return figure
+
+            trace.cache = 'miss'
+            return self._entries.put(key, builder(*inputs, **options))
+
+    def stats(self):
+        return self._entries.stats()
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+figure_cache = FigureCache(name='figures')
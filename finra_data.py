@@ -0,0 +1,409 @@
+import os
+import threading
+import warnings
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+from cache_utils import NegativeCache, SingleFlight
+from http_fetch import FetchEngine
+from perf_trace import span, traced
+from shared_cache import shared_cache
+
+# ==================== FINRA 일별 공매도 파일 ====================
+FINRA_DAILY_URL = "https://cdn.finra.org/equity/regsho/daily/CNMSshvol{date}.txt"
+
+# 파일마다 대소문자가 섞여 있어 표준 컬럼명으로 통일
+FINRA_COLUMNS = {'symbol': 'Symbol', 'shortvolume': 'ShortVolume', 'totalvolume': 'TotalVolume'}
+
+# 게시된 파일은 바뀌지 않으므로 공유 캐시에 오래 보관 (레플리카 간 재사용)
+FINRA_SHARED_TTL = 30 * 24 * 3600
+
+# 로컬 아카이브 위치 (환경변수로 변경 가능)
+FINRA_ARCHIVE_DIR = os.environ.get(
+    'FINRA_ARCHIVE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.finra_archive')
+)
+
+
+def _compact_volume(values):
+    # 정수이고 범위 안이면 uint32, 결측/소수점 거래량(분할 주식)이 있으면 float64 유지
+    if len(values) and not (np.isfinite(values).all() and values.min() >= 0 and values.max() < 2 ** 32
+                            and (np.mod(values, 1) == 0).all()):
+        return values
+    return values.astype('uint32')
+
+
+@traced('finra.parse')
+def parse_finra_file(content, symbols=None, chunksize=200_000):
+    """CNMSshvol 파일(bytes)에서 Symbol/ShortVolume/TotalVolume만 읽어 Symbol 인덱스 DataFrame으로 변환
+
+    symbols를 주면 청크 단위로 읽으면서 해당 종목 행만 남김
+    """
+    # 헤더만 먼저 읽어 실제 컬럼명(대소문자/공백 포함)을 표준 이름에 매핑
+    # 줄바꿈이 없으면(헤더만 있거나 본문이 잘린 파일) 전체를 헤더로 보고 데이터 행 없이 빈 결과 반환
+    newline = content.find(b'\n')
+    header = (content if newline < 0 else content[:newline]).decode('utf-8').rstrip('\r').split('|')
+    raw_names = {c.strip().lower(): c for c in header}
+    columns = {raw_names[key]: name for key, name in FINRA_COLUMNS.items()}
+
+    reader = pd.read_csv(
+        BytesIO(content), sep='|', usecols=list(columns), chunksize=chunksize,
+        dtype={raw: ('str' if name == 'Symbol' else 'float64') for raw, name in columns.items()},
+    ) if newline >= 0 else []
+    wanted = {s.upper() for s in symbols} if symbols is not None else None
+
+    chunks = []
+    for chunk in reader:
+        chunk = chunk.rename(columns=columns).dropna(subset=['Symbol'])
+        chunk['Symbol'] = chunk['Symbol'].str.upper()
+        if wanted is not None:
+            chunk = chunk[chunk['Symbol'].isin(wanted)]
+        chunks.append(chunk)
+    df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame(columns=list(FINRA_COLUMNS.values()))
+
+    # 한 번의 factorize로 중복 제거(티커별 첫 행, 기존 iloc[0] 동작과 동일)와 categorical 인덱스를 함께 처리
+    codes, uniques = pd.factorize(df['Symbol'])
+    _, first_rows = np.unique(codes, return_index=True)
+    index = pd.CategoricalIndex(pd.Categorical.from_codes(codes[first_rows], uniques), name='Symbol')
+    return pd.DataFrame({
+        'ShortVolume': _compact_volume(df['ShortVolume'].to_numpy()[first_rows]),
+        'TotalVolume': _compact_volume(df['TotalVolume'].to_numpy()[first_rows]),
+    }, index=index)
+
+
+class FinraArchive:
+    """게시된 FINRA 파일은 바뀌지 않으므로 거래일별 Parquet 파티션으로 디스크에 보관"""
+
+    def __init__(self, root=FINRA_ARCHIVE_DIR):
+        self.root = root
+
+    def path(self, date_str):
+        return os.path.join(self.root, f"trade_date={date_str}", "part-0.parquet")
+
+    def load(self, date_str):
+        path = self.path(date_str)
+        if not os.path.exists(path):
+            return None
+        try:
+            return pd.read_parquet(path)
+        except Exception:
+            return None
+
+    def save(self, date_str, frame):
+        path = self.path(date_str)
+        tmp_path = f"{path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            frame.to_parquet(tmp_path)
+            # 동시에 읽는 프로세스가 반쯤 쓰인 파일을 보지 않도록 원자적 교체
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def dates(self):
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(
+            name.split('=', 1)[1] for name in os.listdir(self.root)
+            if name.startswith('trade_date=') and os.path.exists(self.path(name.split('=', 1)[1]))
+        )
+
+
+class FinraDayStore:
+    """날짜별 FINRA 파일을 한 번만 받아 모든 티커가 공유하는 저장소"""
+
+    def __init__(self, url_template=FINRA_DAILY_URL, max_days=120, archive=None, engine=None, misses=None,
+                 flights=None, shared=shared_cache):
+        self.url_template = url_template
+        self.archive = archive
+        self.engine = engine or FetchEngine(stage='finra.download')
+        self.misses = misses or NegativeCache(ttl=900)
+        self.flights = flights or SingleFlight()
+        self.shared = shared
+        self.max_days = max_days
+        self._days = {}
+        self._matrix = None
+        self._lock = threading.Lock()
+
+    def prefetch(self, date_strs):
+        # 메모리 → 디스크 아카이브 → 공유 캐시(다른 레플리카가 받은 파일) → 네트워크 순으로 조회, 없는 날짜만 병렬 다운로드
+        # 404/네트워크 오류는 negative 캐시에 기록해 재확인 시점 전까지는 요청하지 않음
+        # 다른 세션이 이미 받고 있는 날짜는 다시 요청하지 않고 그 결과를 기다림 (single-flight)
+        with span('finra.prefetch') as trace:
+            with self._lock:
+                requested = list(dict.fromkeys(date_strs))
+                missing = [d for d in requested if d not in self._days]
+
+            urls = {self.url_template.format(date=d): d for d in missing}
+            urls = {url: d for url, d in urls.items() if not self.misses.is_known_miss(url)}
+            self.flights.do_many(list(urls), lambda owned: self._load({url: urls[url] for url in owned}, trace))
+            # 메모리/아카이브에서 찾거나 다른 세션이 받아 온 날짜는 적중, 직접 다운로드한 날짜는 미스
+            trace.add(hits=len(requested) - trace.misses)
+
+    def _load(self, urls, trace):
+        with self._lock:
+            # 대기 중 다른 호출이 이미 받아 둔 날짜는 제외
+            urls = {url: d for url, d in urls.items() if d not in self._days}
+
+        not_archived = {}
+        for url, date_str in urls.items():
+            frame = self.archive.load(date_str) if self.archive else None
+            if frame is not None:
+                self._remember(date_str, frame)
+            else:
+                not_archived[url] = date_str
+
+        to_download = {}
+        shared = self.shared.get_many(list(not_archived)) if self.shared else {}
+        for url, date_str in not_archived.items():
+            if url in shared:
+                if self.archive:
+                    self.archive.save(date_str, shared[url])
+                self._remember(date_str, shared[url])
+            else:
+                to_download[url] = date_str
+        trace.add(misses=len(to_download))
+
+        for url, result in self.engine.fetch_many(to_download).items():
+            date_str = to_download[url]
+            if not result.ok:
+                self.misses.record_miss(url, result.error or f"HTTP {result.status_code}")
+                continue
+            try:
+                frame = parse_finra_file(result.content)
+            except Exception as e:
+                self.misses.record_miss(url, e)
+                continue
+            self.misses.record_hit(url)
+            if self.archive:
+                self.archive.save(date_str, frame)
+            if self.shared:
+                self.shared.set(url, frame, ttl=FINRA_SHARED_TTL)
+            self._remember(date_str, frame)
+
+    def get_day(self, date_str):
+        with self._lock:
+            if date_str in self._days:
+                return self._days[date_str]
+        self.prefetch([date_str])
+        with self._lock:
+            return self._days.get(date_str)
+
+    def _remember(self, date_str, frame):
+        with self._lock:
+            self._days[date_str] = frame
+            if len(self._days) > self.max_days:
+                del self._days[min(self._days)]
+
+    def has_day(self, date_str):
+        with self._lock:
+            return date_str in self._days
+
+    def matrix(self, date_strs, fetch=True):
+        """요청 날짜 중 확보된 파일로 ShortVolumeMatrix 생성 (같은 날짜 구성이면 재사용)
+
+        fetch=False면 다운로드 없이 이미 메모리에 있는 날짜만 사용 (백그라운드 갱신 사용 시)
+        """
+        if fetch:
+            self.prefetch(date_strs)
+        with self._lock:
+            available = tuple(sorted(d for d in set(date_strs) if d in self._days))
+            if self._matrix is not None:
+                if self._matrix.dates == available:
+                    return self._matrix
+                # 더 짧은 기간(예: 10일 요약 vs 60일 시계열)은 기존 행렬의 행 뷰로 제공
+                subset = self._matrix.subset(available)
+                if subset is not None:
+                    return subset
+            frames = {d: self._days[d] for d in available}
+        matrix = ShortVolumeMatrix.from_frames(frames)
+        with self._lock:
+            self._matrix = matrix
+        return matrix
+
+    def forget_missing(self, date_strs):
+        # 게시된 파일은 불변이므로 아직 없던 날짜만 즉시 다시 확인하도록 negative 캐시에서 제거
+        self.misses.forget([self.url_template.format(date=d) for d in date_strs])
+
+    def clear(self):
+        with self._lock:
+            self._days.clear()
+            self._matrix = None
+
+
+# ==================== 거래일 × 종목 배열 저장소 ====================
+def _display_date(date_str):
+    return f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:]}"
+
+
+class ShortVolumeMatrix:
+    """여러 거래일의 공매도 거래량을 (날짜, 종목 번호) 2차원 NumPy 배열로 보관
+
+    symbol_ids 사전으로 종목 열을 찾으므로 종목별 시계열/날짜별 단면 모두 O(1) 슬라이스
+    """
+
+    def __init__(self, dates, symbols, short_volume, total_volume, short_ratio=None, symbol_ids=None):
+        self.dates = tuple(dates)
+        self.date_ids = {d: i for i, d in enumerate(self.dates)}
+        self.symbols = symbols if isinstance(symbols, list) else list(symbols)
+        self.symbol_ids = symbol_ids if symbol_ids is not None else {s: j for j, s in enumerate(self.symbols)}
+        self.short_volume = short_volume
+        self.total_volume = total_volume
+        if short_ratio is None:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                short_ratio = np.where(total_volume > 0, short_volume / total_volume * 100, np.nan)
+        self.short_ratio = short_ratio
+        # 프로세스 전체 세션이 복사 없이 같은 배열을 읽으므로 쓰기 금지
+        for array in (self.short_volume, self.total_volume, self.short_ratio):
+            array.flags.writeable = False
+
+    @classmethod
+    def from_frames(cls, frames):
+        """{YYYYMMDD: parse_finra_file 결과} → 날짜 오름차순 배열 (없는 값은 NaN)"""
+        dates = sorted(frames)
+        symbols = pd.Index([])
+        for d in dates:
+            symbols = symbols.union(frames[d].index.astype(str))
+        short_volume = np.full((len(dates), len(symbols)), np.nan)
+        total_volume = np.full((len(dates), len(symbols)), np.nan)
+        for i, d in enumerate(dates):
+            columns = symbols.get_indexer(frames[d].index.astype(str))
+            short_volume[i, columns] = frames[d]['ShortVolume'].to_numpy(dtype='float64')
+            total_volume[i, columns] = frames[d]['TotalVolume'].to_numpy(dtype='float64')
+        return cls(dates, symbols, short_volume, total_volume)
+
+    def subset(self, date_strs):
+        """일부 날짜만 담은 행렬 (연속 구간이면 복사 없는 뷰, 종목 목록/사전도 공유). 없는 날짜가 있으면 None"""
+        if any(d not in self.date_ids for d in date_strs):
+            return None
+        rows = sorted(self.date_ids[d] for d in date_strs)
+        dates = [self.dates[i] for i in rows]
+        if rows and rows == list(range(rows[0], rows[-1] + 1)):
+            rows = slice(rows[0], rows[-1] + 1)
+        return ShortVolumeMatrix(dates, self.symbols, self.short_volume[rows], self.total_volume[rows],
+                                 self.short_ratio[rows], self.symbol_ids)
+
+    def __contains__(self, ticker):
+        return ticker.upper() in self.symbol_ids
+
+    def series(self, ticker):
+        """한 종목의 날짜 오름차순 시계열 (기존 historical_data와 같은 컬럼)"""
+        j = self.symbol_ids.get(ticker.upper())
+        if j is None:
+            return pd.DataFrame(columns=['date', 'short_volume', 'total_volume', 'short_ratio'])
+        valid = ~np.isnan(self.short_ratio[:, j]) & ~np.isnan(self.short_volume[:, j])
+        return pd.DataFrame({
+            'date': [_display_date(d) for d, ok in zip(self.dates, valid) if ok],
+            'short_volume': self.short_volume[valid, j].astype('int64'),
+            'total_volume': self.total_volume[valid, j].astype('int64'),
+            'short_ratio': self.short_ratio[valid, j].round(2),
+        })
+
+    def cross_section(self, date_str):
+        """한 거래일의 전체 종목 단면 (Symbol 인덱스). 배열 행을 복사 없이 감싼 읽기 전용 뷰, 없는 날짜면 None"""
+        i = self.date_ids.get(date_str)
+        if i is None:
+            return None
+        return pd.DataFrame({
+            'short_volume': self.short_volume[i], 'total_volume': self.total_volume[i],
+            'short_ratio': self.short_ratio[i],
+        }, index=pd.Index(self.symbols, name='Symbol'), copy=False)
+
+
+# ==================== 전체 종목 스크리너 ====================
+def screen_short_volume(store, date_strs, top_n=50, window=5, min_total_volume=1_000_000, sort_by='short_ratio',
+                        fetch=True):
+    """모든 종목의 공매도 비율/이동평균/전일 대비 변화를 한 번에 계산해 상위 top_n 반환"""
+    matrix = store.matrix(date_strs, fetch=fetch)
+    if not matrix.dates:
+        return pd.DataFrame()
+
+    # 날짜 × 종목 배열 전체에 대해 한 번의 벡터 연산으로 처리
+    ratio = matrix.short_ratio
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        screen = pd.DataFrame({
+            'short_ratio': ratio[-1],
+            f'avg_short_ratio_{window}d': np.nanmean(ratio[-window:], axis=0),
+            'avg_short_ratio_all': np.nanmean(ratio, axis=0),
+            'change_1d': ratio[-1] - ratio[-2] if len(ratio) > 1 else np.nan,
+            'short_volume': matrix.short_volume[-1],
+            'total_volume': matrix.total_volume[-1],
+            'data_points': (~np.isnan(ratio)).sum(axis=0),
+        }, index=pd.Index(matrix.symbols, name='Symbol'))
+    screen = screen[screen['total_volume'] >= min_total_volume].dropna(subset=['short_ratio'])
+    screen = screen.sort_values(sort_by, ascending=False).head(top_n).round(2)
+    screen.insert(0, 'latest_date', _display_date(matrix.dates[-1]))
+    return screen.reset_index()
+
+
+# ==================== 선택 종목 시계열 패널 ====================
+@traced('finra.panel')
+def short_ratio_panel(matrix, tickers, ma_window=7, recent_days=30):
+    """선택 종목을 날짜 × 종목 패널로 한 번 잘라 이동평균/변동성/분위수/상관계수를 일괄 계산
+
+    반환 dict (시계열 탭의 모든 차트/표가 공유):
+      short_ratio / short_volume / total_volume: DatetimeIndex × 종목 (데이터 없는 칸은 NaN)
+      ma / rolling_std: 종목별 관측된 ma_window 거래일 이동평균/표준편차 (관측 없는 날은 NaN)
+      stats: 종목별 평균·표준편차·최소·최대·범위·분위수·최근 이동 표준편차 (관측치 2개 이상)
+      recent: 최근 recent_days일 long 형식 (date, short_volume, total_volume, short_ratio, ticker)
+      correlation: 최근 구간 종목별 거래량 ↔ 공매도 비율 상관계수
+    """
+    # 데이터가 하나도 없는 종목은 제외 (입력 순서 유지)
+    columns = [(t, matrix.symbol_ids[t.upper()]) for t in tickers if t.upper() in matrix.symbol_ids]
+    ids = [j for _, j in columns]
+    index = pd.DatetimeIndex(pd.to_datetime(list(matrix.dates), format='%Y%m%d'), name='date')
+
+    def frame(values):
+        return pd.DataFrame(values[:, ids], index=index, columns=pd.Index([t for t, _ in columns], name='ticker'))
+
+    ratio = frame(matrix.short_ratio).round(2)
+    keep = ratio.notna().any()
+    ratio = ratio.loc[:, keep]
+    names = ratio.columns
+    # 기존 종목별 시계열과 같이 비율이 없는 날은 거래량도 비움
+    valid = ratio.notna()
+    short_volume = frame(matrix.short_volume).loc[:, keep].where(valid)
+    total_volume = frame(matrix.total_volume).loc[:, keep].where(valid)
+
+    # 이동 통계는 기존 종목별 시계열처럼 관측된 날만 이어서 계산 (빈 날 하나가 창 전체를 NaN으로 만들지 않도록)
+    observed = {name: ratio[name].dropna().rolling(ma_window) for name in names}
+    ma = pd.DataFrame({name: rolling.mean() for name, rolling in observed.items()}, index=index, columns=names)
+    rolling_std = pd.DataFrame({name: rolling.std() for name, rolling in observed.items()}, index=index, columns=names)
+
+    quantiles = ratio.quantile([0.25, 0.5, 0.75])
+    stats = pd.DataFrame({
+        'Avg_Short_Ratio': ratio.mean(),
+        'Std_Dev': ratio.std(),
+        'Min': ratio.min(),
+        'Max': ratio.max(),
+        'Range': ratio.max() - ratio.min(),
+        'P25': quantiles.loc[0.25],
+        'Median': quantiles.loc[0.5],
+        'P75': quantiles.loc[0.75],
+        f'Rolling_Std_{ma_window}d': rolling_std.ffill().iloc[-1] if len(index) else np.nan,
+    }, index=names)
+    stats = stats[valid.sum() > 1].rename_axis('Ticker').reset_index()
+
+    # 최근 구간: 종목 순서대로 이어 붙인 long 형식 (열 우선 ravel, 종목별 concat 없음)
+    in_recent = index >= index.max() - pd.Timedelta(days=recent_days) if len(index) else np.zeros(0, dtype=bool)
+    recent_index = index[in_recent]
+    recent = pd.DataFrame({
+        'date': np.tile(recent_index, len(names)),
+        'short_volume': short_volume[in_recent].to_numpy().ravel(order='F'),
+        'total_volume': total_volume[in_recent].to_numpy().ravel(order='F'),
+        'short_ratio': ratio[in_recent].to_numpy().ravel(order='F'),
+        'ticker': np.repeat(np.asarray(names, dtype=object), len(recent_index)),
+    }).dropna(subset=['short_ratio']).reset_index(drop=True)
+    correlation = ratio[in_recent].corrwith(total_volume[in_recent])
+
+    return {
+        'short_ratio': ratio, 'short_volume': short_volume, 'total_volume': total_volume,
+        'ma': ma, 'rolling_std': rolling_std, 'stats': stats, 'recent': recent, 'correlation': correlation,
+    }
+
+
+finra_store = FinraDayStore(archive=FinraArchive(), misses=NegativeCache(ttl=900, name='finra'),
+                            flights=SingleFlight('finra.days'))
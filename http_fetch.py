@@ -0,0 +1,113 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from perf_trace import span
+
+# ==================== 동시 다운로드 엔진 ====================
+# 재시도 대상 상태 코드 (404 등은 즉시 결과 반환)
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class FetchResult:
+    def __init__(self, url, status_code=None, content=None, error=None, attempts=0):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.error = error
+        self.attempts = attempts
+
+    @property
+    def ok(self):
+        return self.status_code == 200
+
+    @property
+    def not_found(self):
+        return self.status_code == 404
+
+
+class RateLimiter:
+    """호스트별 토큰 버킷 (초당 rate회, 최대 burst회 연속 허용)"""
+
+    def __init__(self, rate=10.0, burst=5):
+        self.rate = rate
+        self.burst = burst
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, host):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                tokens, updated = self._buckets.get(host, (self.burst, now))
+                tokens = min(self.burst, tokens + (now - updated) * self.rate)
+                if tokens >= 1:
+                    self._buckets[host] = (tokens - 1, now)
+                    return
+                self._buckets[host] = (tokens, now)
+                wait = (1 - tokens) / self.rate
+            time.sleep(wait)
+
+
+class FetchEngine:
+    """커넥션 풀을 공유하는 requests.Session 기반 병렬 다운로더 (지수 백오프 + 지터 재시도)"""
+
+    def __init__(self, max_workers=8, rate_per_host=10.0, burst=5, max_retries=3,
+                 backoff_base=0.5, backoff_max=8.0, timeout=10, stage='http.fetch'):
+        self.stage = stage
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.rate_limiter = RateLimiter(rate_per_host, burst)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def backoff(self, attempt):
+        # full jitter: 0 ~ min(max, base * 2^attempt)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def fetch(self, url):
+        with span(self.stage) as trace:
+            result = self._fetch(url)
+            trace.add(bytes=len(result.content or b''), retries=max(0, result.attempts - 1))
+            if not result.ok and not result.not_found:
+                trace.fail(result.error or f"HTTP {result.status_code}")
+            return result
+
+    def _fetch(self, url):
+        host = urlparse(url).netloc
+        result = FetchResult(url)
+
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire(host)
+            result.attempts = attempt + 1
+            try:
+                response = self.session.get(url, timeout=self.timeout)
+            except requests.RequestException as e:
+                result.status_code, result.content, result.error = None, None, e
+            else:
+                result.status_code, result.error = response.status_code, None
+                result.content = response.content if response.status_code == 200 else None
+                if response.status_code not in RETRY_STATUSES:
+                    return result
+
+            if attempt < self.max_retries:
+                time.sleep(self.backoff(attempt))
+        return result
+
+    def fetch_many(self, urls):
+        urls = list(dict.fromkeys(urls))
+        if not urls:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(urls))) as executor:
+            return dict(zip(urls, executor.map(self.fetch, urls)))
@@ -1,15 +1,22 @@
 import streamlit as st
-import yfinance as yf
 import pandas as pd
-import numpy as np
-from datetime import datetime, timedelta
+from datetime import datetime
 import warnings
-import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
-import requests
-from io import StringIO
-import time
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+import data_service
+from cache_utils import SizedLRUCache
+from data_service import MAG7_STOCKS
+import charts
+from figure_cache import figure_cache
+from finra_data import finra_store, screen_short_volume, short_ratio_panel
+from market_calendar import published_trading_days
+from perf_trace import serve_metrics, span, traced, traced_cache, tracer
+from price_data import fetch_fundamentals, forget_fundamentals, vwap_engine
+from refresh_scheduler import RefreshScheduler
+from scoring import short_pressure_scores
 
 warnings.filterwarnings('ignore')
 
@@ -54,211 +61,147 @@ with st.sidebar:
         st.session_state['password_correct'] = False
         st.rerun()
 
-# ==================== MAG 7+2 정의 ====================
-MAG7_STOCKS = {
-    'AAPL': {'name': 'Apple Inc.', 'description': '아이폰, 생태계, 온디바이스 AI', 'sector': 'Technology', 'industry': 'Consumer Electronics'},
-    'MSFT': {'name': 'Microsoft Corporation', 'description': '클라우드(Azure), 생성형 AI (OpenAI 대주주)', 'sector': 'Technology', 'industry': 'Software'},
-    'GOOGL': {'name': 'Alphabet Inc.', 'description': '구글 검색, 유튜브, AI (Gemini)', 'sector': 'Communication Services', 'industry': 'Internet Content & Information'},
-    'AMZN': {'name': 'Amazon.com Inc.', 'description': '전자상거래, 클라우드(AWS) 1위', 'sector': 'Consumer Cyclical', 'industry': 'Internet Retail'},
-    'NVDA': {'name': 'NVIDIA Corporation', 'description': 'AI 반도체(GPU) 독점적 지배자', 'sector': 'Technology', 'industry': 'Semiconductors'},
-    'META': {'name': 'Meta Platforms Inc.', 'description': '페이스북, 인스타그램, AI(Llama)', 'sector': 'Communication Services', 'industry': 'Internet Content & Information'},
-    'TSLA': {'name': 'Tesla Inc.', 'description': '전기차, 자율주행, 로봇', 'sector': 'Consumer Cyclical', 'industry': 'Auto Manufacturers'},
-    'COIN': {'name': 'Coinbase Global Inc.', 'description': '미국 최대 암호화폐 거래소, 비트코인 직접 노출', 'sector': 'Financial Services', 'industry': 'Cryptocurrency Exchange'},
-    'IBIT': {'name': 'iShares Bitcoin Trust ETF', 'description': 'BlackRock 비트코인 현물 ETF, 순수 BTC 노출', 'sector': 'ETF', 'industry': 'Bitcoin Spot ETF'}
-}
+# 데이터 수집 동시 작업 수 (종목 × 데이터 소스)
+COLLECT_MAX_WORKERS = 18
 
-# ==================== 유틸리티 함수 ====================
-@st.cache_data(ttl=3600)
-def get_current_quarter_start():
-    now = datetime.now()
-    quarter = (now.month - 1) // 3
-    quarter_start_month = quarter * 3 + 1
-    return datetime(now.year, quarter_start_month, 1)
-
-def calculate_anchored_vwap(df):
-    df = df.copy()
-    df['Typical_Price'] = (df['High'] + df['Low'] + df['Close']) / 3
-    df['TP_Volume'] = df['Typical_Price'] * df['Volume']
-    df['Cumulative_TP_Volume'] = df['TP_Volume'].cumsum()
-    df['Cumulative_Volume'] = df['Volume'].cumsum()
-    df['Anchored_VWAP'] = df['Cumulative_TP_Volume'] / df['Cumulative_Volume']
-    return df
-
-@st.cache_data(ttl=3600)
-def get_finra_short_volume_csv(ticker, days_back=10):
-    try:
-        today = datetime.now()
-        short_volume_data = []
-        
-        for days in range(days_back):
-            check_date = today - timedelta(days=days)
-            if check_date.weekday() >= 5:
-                continue
-            
-            date_str = check_date.strftime('%Y%m%d')
-            url = f"https://cdn.finra.org/equity/regsho/daily/CNMSshvol{date_str}.txt"
-            
-            try:
-                response = requests.get(url, timeout=10)
-                if response.status_code == 200:
-                    df = pd.read_csv(StringIO(response.text), sep='|')
-                    df.columns = df.columns.str.strip()
-                    symbol_col = 'Symbol' if 'Symbol' in df.columns else 'symbol'
-                    ticker_data = df[df[symbol_col].str.upper() == ticker.upper()]
-                    
-                    if not ticker_data.empty:
-                        row = ticker_data.iloc[0]
-                        short_vol = row.get('ShortVolume', row.get('shortVolume', 0))
-                        total_vol = row.get('TotalVolume', row.get('totalVolume', 0))
-                        
-                        if pd.notna(short_vol) and pd.notna(total_vol) and total_vol > 0:
-                            short_volume_data.append({
-                                'date': check_date.strftime('%Y-%m-%d'),
-                                'short_volume': int(short_vol),
-                                'total_volume': int(total_vol),
-                                'short_ratio': round(short_vol / total_vol * 100, 2)
-                            })
-            except:
-                continue
-        
-        if short_volume_data:
-            df_short = pd.DataFrame(short_volume_data)
-            return {
-                'ticker': ticker,
-                'latest_date': df_short.iloc[0]['date'],
-                'latest_short_ratio': df_short.iloc[0]['short_ratio'],
-                'avg_short_ratio_10d': round(df_short['short_ratio'].mean(), 2),
-                'data_points': len(df_short),
-                'historical_data': df_short
-            }
-        return None
-    except:
-        return None
+# 가격은 증분 VWAP 엔진으로 새 봉만 받아오므로 짧은 주기로 갱신
+PRICE_REFRESH_TTL = 300
 
-@st.cache_data(ttl=3600)
-def get_short_interest_from_yfinance(ticker):
-    try:
-        stock = yf.Ticker(ticker)
-        info = stock.info
-        
-        short_data = {
-            'ticker': ticker,
-            'short_ratio': info.get('shortRatio', 0),
-            'short_percent_float': info.get('shortPercentOfFloat', 0) * 100 if info.get('shortPercentOfFloat') else 0,
-            'shares_short': info.get('sharesShort', 0),
-            'shares_short_prior_month': info.get('sharesShortPriorMonth', 0),
-        }
-        
-        if short_data['shares_short_prior_month'] > 0:
-            short_data['short_change_pct'] = ((short_data['shares_short'] - short_data['shares_short_prior_month']) / 
-                                               short_data['shares_short_prior_month'] * 100)
-        else:
-            short_data['short_change_pct'] = 0
-        return short_data
-    except:
-        return None
-
-@st.cache_data(ttl=3600)
-def get_comprehensive_short_data(ticker):
-    yf_data = get_short_interest_from_yfinance(ticker)
-    finra_data = get_finra_short_volume_csv(ticker, days_back=60)
-    
-    combined_data = {
-        'ticker': ticker, 'short_ratio_days': 0, 'short_percent_float': 0,
-        'shares_short_millions': 0, 'short_change_pct': 0, 'daily_short_ratio': 0,
-        'avg_daily_short_ratio_10d': 0, 'finra_latest_date': 'N/A',
-        'finra_historical': None, 'data_source': []
-    }
-    
-    if yf_data:
-        combined_data.update({
-            'short_ratio_days': round(yf_data.get('short_ratio', 0), 2),
-            'short_percent_float': round(yf_data.get('short_percent_float', 0), 2),
-            'shares_short_millions': round(yf_data.get('shares_short', 0) / 1e6, 2),
-            'short_change_pct': round(yf_data.get('short_change_pct', 0), 2),
-        })
-        combined_data['data_source'].append('Yahoo Finance')
-    
-    if finra_data:
-        combined_data['daily_short_ratio'] = finra_data['latest_short_ratio']
-        combined_data['avg_daily_short_ratio_10d'] = finra_data['avg_short_ratio_10d']
-        combined_data['finra_latest_date'] = finra_data.get('latest_date', 'N/A')
-        combined_data['finra_historical'] = finra_data.get('historical_data')
-        combined_data['data_source'].append(f"FINRA ({finra_data.get('data_points', 0)}일)")
-    
-    combined_data['data_source'] = ' + '.join(combined_data['data_source']) if combined_data['data_source'] else 'N/A'
-    return combined_data
+# FINRA 파일은 finra_store가 보관하므로 파생 결과는 미게시 날짜 재확인 주기에 맞춰 갱신
+FINRA_REFRESH_TTL = 900
 
-@st.cache_data(ttl=3600)
-def get_quarterly_vwap_analysis(ticker):
-    try:
-        quarter_start = get_current_quarter_start()
-        end_date = datetime.now()
-        quarter_num = (quarter_start.month - 1) // 3 + 1
+# 펀더멘털(.info) 스냅샷은 가격과 별도 TTL로 캐싱
+FUNDAMENTALS_TTL = 4 * 3600
 
-        stock = yf.Ticker(ticker)
-        df = stock.history(start=quarter_start, end=end_date)
+# 가격/공매도/펀더멘털 결과 캐시의 메모리 상한 (초과 시 오래 안 쓴 항목부터 제거)
+APP_CACHE_MAX_MB = float(os.environ.get('APP_CACHE_MAX_MB', '256'))
 
-        if df.empty or len(df) < 5:
-            return None
+# 백그라운드 갱신 사용 여부 (0이면 페이지 실행 중에 직접 수집)
+BACKGROUND_REFRESH = os.environ.get('BACKGROUND_REFRESH', '1') != '0'
 
-        df = calculate_anchored_vwap(df)
-        current_price = df['Close'].iloc[-1]
-        current_vwap = df['Anchored_VWAP'].iloc[-1]
-        above_vwap_ratio = (df['Close'] > df['Anchored_VWAP']).sum() / len(df) * 100
-        
-        recent_20 = df['Close'].tail(min(20, len(df)))
-        uptrend_strength = (recent_20.diff() > 0).sum() / len(recent_20) * 100 if len(recent_20) > 1 else 50
-        
-        recent_volume = df['Volume'].tail(5).mean()
-        avg_volume = df['Volume'].mean()
-        volume_ratio = recent_volume / avg_volume if avg_volume > 0 else 1
+# 백그라운드 수집 중일 때 완료 여부를 확인하는 간격 (초, 완료되면 페이지를 다시 실행)
+SCHEDULER_POLL_SECONDS = 2
 
-        info = stock.info
-        quarter_start_price = df['Close'].iloc[0]
-        quarter_return = ((current_price - quarter_start_price) / quarter_start_price * 100)
+# 주기 실행 fragment (st.fragment는 1.37부터, 그 이전은 experimental_fragment)
+poll_fragment = getattr(st, 'fragment', None) or st.experimental_fragment
 
-        return {
-            'Ticker': ticker, 'Company': MAG7_STOCKS[ticker]['name'],
-            'Description': MAG7_STOCKS[ticker]['description'],
-            'Current_Price': round(current_price, 2),
-            'Anchored_VWAP': round(current_vwap, 2),
-            'Quarter_Return_%': round(quarter_return, 2),
-            'Price_vs_VWAP_%': round((current_price - current_vwap) / current_vwap * 100, 2),
-            'Above_VWAP_Days_%': round(above_vwap_ratio, 1),
-            'Uptrend_Strength_%': round(uptrend_strength, 1),
-            'Volume_Ratio': round(volume_ratio, 2),
-            'Is_Above_VWAP': current_price > current_vwap,
-            'Market_Cap': info.get('marketCap', 0),
-        }
-    except Exception as e:
-        return None
+# 설정 시 Prometheus가 수집할 수 있도록 http://<host>:<port>/metrics 제공
+PERF_METRICS_PORT = os.environ.get('PERF_METRICS_PORT')
+# 기본은 로컬(127.0.0.1)에만 바인딩, 외부 노출은 PERF_METRICS_HOST=0.0.0.0 으로 명시적으로 선택
+PERF_METRICS_HOST = os.environ.get('PERF_METRICS_HOST', '127.0.0.1')
+if PERF_METRICS_PORT:
+    try:
+        serve_metrics(int(PERF_METRICS_PORT), PERF_METRICS_HOST)
+    except:
+        pass
 
-def calculate_buy_score(row):
-    score = 0
-    if row['Is_Above_VWAP']: score += 30
-    price_diff = row['Price_vs_VWAP_%']
-    if 0 < price_diff <= 5: score += 20
-    elif 5 < price_diff <= 10: score += 10
-    elif price_diff > 10: score += 5
-    if row['Above_VWAP_Days_%'] >= 80: score += 20
-    elif row['Above_VWAP_Days_%'] >= 60: score += 15
-    if row['Uptrend_Strength_%'] >= 60: score += 15
-    elif row['Uptrend_Strength_%'] >= 50: score += 10
-    if row['Volume_Ratio'] >= 1.2: score += 15
-    elif row['Volume_Ratio'] >= 1.0: score += 10
-    return min(score, 100)
+# ==================== 유틸리티 함수 ====================
+@st.cache_resource
+def get_refresh_scheduler():
+    # 프로세스당 하나만 만들어 모든 세션이 같은 최신 스냅샷을 읽음
+    return RefreshScheduler(
+        list(MAG7_STOCKS), data_service.current_quarter_start, finra_days=60, price_interval=PRICE_REFRESH_TTL,
+        finra_retry=FINRA_REFRESH_TTL, fundamentals_interval=FUNDAMENTALS_TTL,
+    ).start()
+
+scheduler = get_refresh_scheduler() if BACKGROUND_REFRESH else None
+
+@st.cache_resource
+def get_app_cache():
+    # st.cache_data는 항목 수/메모리 상한이 없어 임의 종목·기간 입력 시 계속 커지므로
+    # 바이트 크기를 재는 프로세스 공용 LRU에 보관 (적중 시 피클 복원 없이 그대로 반환)
+    return SizedLRUCache('app', max_bytes=APP_CACHE_MAX_MB * 2**20)
+
+app_cache = get_app_cache()
+
+@traced_cache('app.finra_short_volume', app_cache.memoize(ttl=FINRA_REFRESH_TTL))
+def get_finra_short_volume_csv(ticker, days_back=10, as_of=None):
+    # 백그라운드 갱신 사용 시 다운로드 없이 이미 받아둔 날짜만 사용
+    # 캐시에는 요약값만 담고 일별 시계열은 finra_store의 공유 행렬(읽기 전용 배열)에서 복사 없이 읽음
+    return data_service.get_finra_short_volume(ticker, days_back, fetch=scheduler is None, include_history=False)
+
+@traced_cache('app.fundamentals', app_cache.memoize(ttl=FUNDAMENTALS_TTL))
+def get_fundamentals_snapshot(ticker, as_of=None):
+    # .info는 느리므로 종목당 한 번만 호출하고 VWAP/공매도 분석이 공유
+    # (as_of는 백그라운드 갱신 버전으로, 새 스냅샷이 들어오면 캐시 키가 바뀜)
+    snapshot = scheduler.snapshot_fundamentals(ticker) if scheduler else fetch_fundamentals(ticker)
+    if snapshot is None:
+        # 실패는 결과 캐시에 남기지 않음 (재시도 간격은 yahoo_misses negative 캐시가 관리)
+        raise LookupError(ticker)
+    return snapshot
+
+def fundamentals_or_empty(ticker, as_of=None):
+    try:
+        return get_fundamentals_snapshot(ticker, as_of)
+    except LookupError:
+        return {}
+
+# 아래 함수는 이미 캐싱된 스냅샷/FINRA 결과를 조합만 하므로 별도 캐시를 두지 않음
+# (실패 결과가 상위 캐시에 1시간씩 남지 않도록)
+def get_comprehensive_short_data(ticker, as_of=None):
+    info = fundamentals_or_empty(ticker, as_of)
+    yf_data = data_service.short_interest_from_snapshot(ticker, info) if info else None
+    finra_data = get_finra_short_volume_csv(ticker, days_back=60, as_of=as_of)
+    return data_service.combine_short_data(ticker, yf_data, finra_data)
+
+@traced_cache('app.vwap_analysis', app_cache.memoize(ttl=PRICE_REFRESH_TTL))
+def get_quarterly_vwap_analysis(ticker, universe=None, as_of=None):
+    # 백그라운드 스케줄러 사용 시 갱신해 둔 누적 프레임만 읽음
+    return data_service.get_quarterly_vwap_analysis(
+        ticker, universe, anchor=data_service.current_quarter_start(),
+        fundamentals=fundamentals_or_empty(ticker, as_of), fetch=scheduler is None,
+    )
 
-def calculate_short_score(row):
-    short_pct = row.get('short_percent_float', 0)
-    if short_pct < 5: return 20
-    elif short_pct < 10: return 15
-    elif short_pct < 20: return 10
-    else: return 5
+@traced_cache('app.short_screen', app_cache.memoize(ttl=FINRA_REFRESH_TTL))
+def get_short_volume_screen(days_back, top_n, window, min_total_volume, sort_by, as_of=None):
+    # 이미 받아둔 FINRA 일별 파일 전체 종목으로 시장 스캔 (추가 네트워크 비용 없음)
+    return screen_short_volume(finra_store, published_trading_days(days_back), top_n=top_n, window=window,
+                               min_total_volume=min_total_volume, sort_by=sort_by, fetch=scheduler is None)
+
+def refresh_live_data(tickers):
+    """새로고침: 변할 수 있는 데이터(미게시 FINRA 날짜, 최신 가격 봉, 펀더멘털)만 선택 종목 단위로 무효화"""
+    finra_store.forget_missing(published_trading_days(60))
+    # 명시적 새로고침이므로 다른 레플리카가 공유 캐시에 남긴 가격 봉/펀더멘털도 쓰지 않음
+    vwap_engine.mark_stale(tickers, refresh=True)
+    
+    if scheduler is not None:
+        # 스케줄러가 즉시 다시 수집하고, 데이터 버전(as_of)이 바뀌어 파생 캐시도 새로 계산됨
+        # (기다리지 않음: 페이지는 '갱신 중'으로 표시하고 수집이 끝나면 자동으로 다시 그림)
+        scheduler.trigger()
+        return
+    
+    forget_fundamentals(tickers)
+    universe = tuple(tickers)
+    for ticker in tickers:
+        get_quarterly_vwap_analysis.clear(ticker, universe)
+        get_fundamentals_snapshot.clear(ticker)
+        get_finra_short_volume_csv.clear(ticker, days_back=60)
+    get_short_volume_screen.clear()
 
 # ==================== 메인 앱 ====================
 st.title("🌟 MAGNIFICENT SEVEN + BITCOIN EXPOSURE 종합 분석")
 st.markdown(f"**데이터 수집 시간:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} (KST)")
+if scheduler is not None:
+    if scheduler.busy():
+        # 수집을 기다리지 않고 지금 있는 스냅샷으로 그린 뒤, 새 데이터가 들어오면 다시 실행
+        st.info("⏳ 데이터 갱신 중... 완료되면 화면이 자동으로 새로 고쳐집니다." if scheduler.ready()
+                else "⏳ 첫 데이터 수집 중... 받은 데이터부터 표시하고 완료되면 자동으로 새로 고쳐집니다.")
+        rendered_version = scheduler.version()
+        
+        @poll_fragment(run_every=SCHEDULER_POLL_SECONDS)
+        def rerun_when_refreshed():
+            if not scheduler.busy() or scheduler.version() != rendered_version:
+                st.rerun()
+        
+        rerun_when_refreshed()
+    updated_labels = {'prices': '가격', 'fundamentals': '펀더멘털', 'finra': 'FINRA'}
+    updated_text = ' · '.join(
+        f"{label} {scheduler.last_updated[job].strftime('%m-%d %H:%M') if job in scheduler.last_updated else '대기 중'}"
+        for job, label in updated_labels.items()
+    )
+    st.caption(f"🕒 마지막 갱신 (미 동부시간): {updated_text}")
+    for job, (failed_at, error) in list(scheduler.last_error.items()):
+        st.caption(f"⚠️ {updated_labels[job]} 갱신 실패 ({failed_at.strftime('%H:%M')}): {error}")
 
 # 사이드바
 with st.sidebar:
@@ -277,51 +220,67 @@ with st.sidebar:
     
     st.markdown("---")
     if st.button("🔄 데이터 새로고침", use_container_width=True):
-        st.cache_data.clear()
+        refresh_live_data(selected_tickers)
         st.rerun()
+    
+    show_perf = st.checkbox("⏱️ 성능 패널", value=False)
 
-# 탭 생성
-tab1, tab2, tab3, tab4, tab5 = st.tabs([
+# 탭 선택 (st.tabs는 숨겨진 탭까지 매번 전부 계산하므로 선택한 화면만 그리도록 라디오로 전환)
+TAB_LABELS = [
     "📊 종합 대시보드", 
     "🔴 공매도 기본 분석", 
     "📈 공매도 시계열 분석",
     "🎯 고급 분석",
-    "📋 데이터"
-])
+    "📋 데이터",
+    "🔎 공매도 스크리너"
+]
+active_tab = st.radio("화면 선택", TAB_LABELS, horizontal=True, key='active_tab', label_visibility='collapsed')
 
 # 데이터 수집
-with st.spinner("데이터 수집 중..."):
+with st.spinner("데이터 수집 중..."), span('app.collect'):
     results = []
     short_data_list = []
     
     progress_bar = st.progress(0)
-    for idx, ticker in enumerate(selected_tickers):
-        result = get_quarterly_vwap_analysis(ticker)
-        if result:
-            results.append(result)
-        
-        short_data = get_comprehensive_short_data(ticker)
-        if short_data:
-            short_data_list.append(short_data)
+    # 종목 × (VWAP, 공매도) 작업을 동시에 실행하고 완료되는 순서대로 진행률 갱신
+    vwap_results, short_results = {}, {}
+    # 백그라운드 갱신 버전을 캐시 키에 포함해 새 스냅샷이 들어오면 다시 계산
+    as_of = scheduler.version() if scheduler is not None else None
+    ctx = get_script_run_ctx()
+    with ThreadPoolExecutor(max_workers=COLLECT_MAX_WORKERS, initializer=add_script_run_ctx, initargs=(None, ctx)) as executor:
+        futures = {}
+        for ticker in selected_tickers:
+            futures[executor.submit(get_quarterly_vwap_analysis, ticker, tuple(selected_tickers), as_of)] = (vwap_results, ticker)
+            futures[executor.submit(get_comprehensive_short_data, ticker, as_of)] = (short_results, ticker)
         
-        progress_bar.progress((idx + 1) / len(selected_tickers))
+        for done, future in enumerate(as_completed(futures), start=1):
+            target, ticker = futures[future]
+            try:
+                target[ticker] = future.result()
+            except Exception:
+                target[ticker] = None
+            progress_bar.progress(done / len(futures))
     progress_bar.empty()
+    
+    # 기존 순차 수집과 같은 순서 유지
+    for ticker in selected_tickers:
+        if vwap_results.get(ticker):
+            results.append(vwap_results[ticker])
+        if short_results.get(ticker):
+            short_data_list.append(short_results[ticker])
 
 if not results:
+    if scheduler is not None and not scheduler.ready():
+        st.stop()
     st.error("데이터를 수집하지 못했습니다.")
     st.stop()
 
-df_results = pd.DataFrame(results)
-df_short = pd.DataFrame(short_data_list)
-df_results = df_results.merge(df_short, left_on='Ticker', right_on='ticker', how='left')
-df_results['Market_Cap_Trillion'] = (df_results['Market_Cap'] / 1e12).round(3)
-df_results['Buy_Signal_Score'] = df_results.apply(calculate_buy_score, axis=1)
-df_results['Short_Score'] = df_results.apply(calculate_short_score, axis=1)
-df_results['Total_Investment_Score'] = df_results['Buy_Signal_Score'] + df_results['Short_Score']
-df_results = df_results.sort_values('Total_Investment_Score', ascending=False)
+with span('app.merge_scoring'):
+    df_results = data_service.build_results(results, short_data_list)
 
 # TAB 1: 종합 대시보드
-with tab1:
+@traced('render.dashboard')
+def render_dashboard_tab():
     st.header("📊 종합 투자 순위")
     
     col1, col2, col3, col4 = st.columns(4)
@@ -341,49 +300,8 @@ with tab1:
     # 종합 점수 비교 차트
     st.subheader("🏆 종합 투자 점수 비교")
     st.caption("💡 **기술적 분석(VWAP)과 공매도 분석을 결합한 종합 평가** - 종합 점수가 높을수록 투자 매력도 높음")
-    fig_total_score = make_subplots(
-        rows=1, cols=2,
-        subplot_titles=('기술적 분석 점수', '종합 투자 점수 (기술적 + 공매도)'),
-        specs=[[{"type": "bar"}, {"type": "bar"}]]
-    )
-    
-    fig_total_score.add_trace(
-        go.Bar(
-            y=df_results['Ticker'],
-            x=df_results['Buy_Signal_Score'],
-            orientation='h',
-            name='기술적 점수',
-            marker_color='#2196F3',
-            text=df_results['Buy_Signal_Score'],
-            textposition='auto',
-            hovertemplate='<b>%{y}</b><br>기술적 점수: %{x}/100<extra></extra>'
-        ),
-        row=1, col=1
-    )
-    
-    fig_total_score.add_trace(
-        go.Bar(
-            y=df_results['Ticker'],
-            x=df_results['Total_Investment_Score'],
-            orientation='h',
-            name='종합 점수',
-            marker_color='#4CAF50',
-            text=df_results['Total_Investment_Score'],
-            textposition='auto',
-            hovertemplate='<b>%{y}</b><br>종합 점수: %{x}/120<extra></extra>'
-        ),
-        row=1, col=2
-    )
-    
-    fig_total_score.update_xaxes(title_text="점수", row=1, col=1)
-    fig_total_score.update_xaxes(title_text="점수", row=1, col=2)
-    fig_total_score.update_yaxes(title_text="종목", row=1, col=1)
-    
-    fig_total_score.update_layout(
-        height=500,
-        showlegend=False,
-        template='plotly_white'
-    )
+    # 차트는 입력 데이터 내용이 같으면 figure_cache에서 재사용 (화면 전환/옵션 토글 시 재구성 생략)
+    fig_total_score = figure_cache.get_or_build('total_score', charts.total_score, df_results)
     
     st.plotly_chart(fig_total_score, use_container_width=True)
     
@@ -397,24 +315,7 @@ with tab1:
     - 오른쪽 하단(높은 공매도 + 낮은 수익률): 위험 종목
     - 버블 크기는 시가총액, 색상은 종합 투자 점수
     """)
-    fig_scatter_performance = px.scatter(
-        df_results,
-        x='short_percent_float',
-        y='Quarter_Return_%',
-        size='Market_Cap_Trillion',
-        color='Total_Investment_Score',
-        hover_data=['Ticker', 'Company'],
-        text='Ticker',
-        color_continuous_scale='RdYlGn',
-        labels={
-            'short_percent_float': '공매도 비율 (%)',
-            'Quarter_Return_%': '분기 수익률 (%)',
-            'Total_Investment_Score': '종합 점수'
-        }
-    )
-    
-    fig_scatter_performance.update_traces(textposition='top center', textfont_size=12)
-    fig_scatter_performance.update_layout(height=500)
+    fig_scatter_performance = figure_cache.get_or_build('scatter_performance', charts.scatter_performance, df_results)
     st.plotly_chart(fig_scatter_performance, use_container_width=True)
     
     st.markdown("---")
@@ -437,7 +338,8 @@ with tab1:
                 st.progress(score / 120)
 
 # TAB 2: 공매도 기본 분석
-with tab2:
+@traced('render.short_basic')
+def render_short_basic_tab():
     st.header("🔴 공매도 기본 분석")
     
     # 비교표
@@ -602,38 +504,14 @@ with tab2:
         # 차트 A: Short % of Float
         st.markdown("##### YF Short % of Float")
         st.caption("💡 **유통주식(Float) 대비 공매도 비율** - 낮을수록 좋음 (5% 미만 권장)")
-        fig_a = go.Figure()
-        colors = ['green' if x < 2 else 'orange' if x < 5 else 'red' for x in df_results['short_percent_float']]
-        fig_a.add_trace(go.Bar(
-            x=df_results['Ticker'], 
-            y=df_results['short_percent_float'],
-            marker=dict(color=colors), 
-            text=df_results['short_percent_float'].round(2),
-            textposition='auto',
-            hovertemplate='<b>%{x}</b><br>공매도 비율: %{y:.2f}%<extra></extra>'
-        ))
-        fig_a.add_hline(y=2, line_dash="dash", line_color="green", annotation_text="매우 건강 (2%)")
-        fig_a.add_hline(y=5, line_dash="dash", line_color="orange", annotation_text="건강 (5%)")
-        fig_a.update_layout(height=400, template='plotly_white', showlegend=False)
+        fig_a = figure_cache.get_or_build('short_float', charts.short_float, df_results)
         st.plotly_chart(fig_a, use_container_width=True)
     
     with col2:
         # 차트 B: Days to Cover
         st.markdown("##### Days to Cover")
         st.caption("💡 **공매도 청산 소요일** - 공매도 잔고를 일평균 거래량으로 나눈 값. 3일 이상이면 Short Squeeze 가능")
-        fig_b = go.Figure()
-        colors_days = ['green' if x < 2 else 'orange' if x < 3 else 'red' for x in df_results['short_ratio_days']]
-        fig_b.add_trace(go.Bar(
-            x=df_results['Ticker'], 
-            y=df_results['short_ratio_days'],
-            marker=dict(color=colors_days), 
-            text=df_results['short_ratio_days'].round(2),
-            textposition='auto',
-            hovertemplate='<b>%{x}</b><br>청산 소요일: %{y:.2f}일<extra></extra>'
-        ))
-        fig_b.add_hline(y=2, line_dash="dash", line_color="green", annotation_text="빠른 청산")
-        fig_b.add_hline(y=3, line_dash="dash", line_color="red", annotation_text="Squeeze 가능")
-        fig_b.update_layout(height=400, template='plotly_white', showlegend=False)
+        fig_b = figure_cache.get_or_build('days_to_cover', charts.days_to_cover, df_results)
         st.plotly_chart(fig_b, use_container_width=True)
     
     col3, col4 = st.columns(2)
@@ -642,39 +520,14 @@ with tab2:
         # 차트 C: Shares Short
         st.markdown("##### Shares Short (백만 주)")
         st.caption("💡 **현재 공매도된 총 주식 수** - 절대적인 공매도 규모를 나타냄. 클수록 변동성 증가 가능")
-        fig_c = go.Figure()
-        fig_c.add_trace(go.Bar(
-            x=df_results['Ticker'],
-            y=df_results['shares_short_millions'],
-            marker=dict(
-                color=df_results['shares_short_millions'],
-                colorscale='Reds',
-                showscale=True,
-                colorbar=dict(title="M")
-            ),
-            text=df_results['shares_short_millions'].round(1),
-            textposition='auto',
-            hovertemplate='<b>%{x}</b><br>공매도 주식: %{y:.1f}M<extra></extra>'
-        ))
-        fig_c.update_layout(height=400, template='plotly_white', showlegend=False)
+        fig_c = figure_cache.get_or_build('shares_short', charts.shares_short, df_results)
         st.plotly_chart(fig_c, use_container_width=True)
     
     with col4:
         # 차트 D: MoM Change
         st.markdown("##### 전월 대비 공매도 변화율")
         st.caption("💡 **전월 대비 공매도 증감률** - 빨강(+)은 공매도 증가(약세 신호), 초록(-)은 감소(강세 신호)")
-        fig_d = go.Figure()
-        colors_change = ['red' if x > 0 else 'green' for x in df_results['short_change_pct']]
-        fig_d.add_trace(go.Bar(
-            x=df_results['Ticker'], 
-            y=df_results['short_change_pct'],
-            marker=dict(color=colors_change), 
-            text=[f"{x:+.1f}%" for x in df_results['short_change_pct']],
-            textposition='auto',
-            hovertemplate='<b>%{x}</b><br>전월 대비: %{y:+.1f}%<extra></extra>'
-        ))
-        fig_d.add_hline(y=0, line_dash="solid", line_color="black", line_width=2)
-        fig_d.update_layout(height=400, template='plotly_white', showlegend=False)
+        fig_d = figure_cache.get_or_build('short_change', charts.short_change, df_results)
         st.plotly_chart(fig_d, use_container_width=True)
     
     st.markdown("---")
@@ -685,101 +538,33 @@ with tab2:
         # 차트 E: FINRA Daily
         st.markdown("##### FINRA Daily Short %")
         st.caption("💡 **최근 거래일의 공매도 거래 비율** - 전체 거래량 중 공매도가 차지하는 비중. 30-40%는 정상")
-        fig_e = go.Figure()
-        colors_finra = ['green' if x < 35 else 'orange' if x < 45 else 'red' for x in df_results['daily_short_ratio']]
-        fig_e.add_trace(go.Bar(
-            x=df_results['Ticker'], 
-            y=df_results['daily_short_ratio'],
-            marker=dict(color=colors_finra), 
-            text=df_results['daily_short_ratio'].round(1),
-            textposition='auto',
-            hovertemplate='<b>%{x}</b><br>일일 공매도: %{y:.1f}%<extra></extra>'
-        ))
-        fig_e.add_hline(y=35, line_dash="dash", line_color="green", annotation_text="낮음 (35%)")
-        fig_e.add_hline(y=45, line_dash="dash", line_color="orange", annotation_text="보통 (45%)")
-        fig_e.update_layout(height=400, template='plotly_white', showlegend=False)
+        fig_e = figure_cache.get_or_build('finra_daily', charts.finra_daily, df_results)
         st.plotly_chart(fig_e, use_container_width=True)
     
     with col6:
         # 차트 F: FINRA 10일 평균 vs 최근일
         st.markdown("##### FINRA 10일 평균 vs 최근일")
         st.caption("💡 **최근 추세 확인** - 최근일이 10일 평균보다 높으면 공매도 증가 추세, 낮으면 감소 추세")
-        fig_f = go.Figure()
-        
-        fig_f.add_trace(go.Bar(
-            x=df_results['Ticker'],
-            y=df_results['avg_daily_short_ratio_10d'],
-            name='10일 평균',
-            marker_color='lightblue',
-            text=df_results['avg_daily_short_ratio_10d'].round(1),
-            textposition='auto',
-            hovertemplate='<b>%{x}</b><br>10일 평균: %{y:.1f}%<extra></extra>'
-        ))
-        
-        fig_f.add_trace(go.Bar(
-            x=df_results['Ticker'],
-            y=df_results['daily_short_ratio'],
-            name='최근일',
-            marker_color='darkblue',
-            text=df_results['daily_short_ratio'].round(1),
-            textposition='auto',
-            hovertemplate='<b>%{x}</b><br>최근일: %{y:.1f}%<extra></extra>'
-        ))
-        
-        fig_f.update_layout(
-            height=400, 
-            template='plotly_white',
-            barmode='group',
-            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
-        )
+        fig_f = figure_cache.get_or_build('finra_10d_vs_latest', charts.finra_10d_vs_latest, df_results)
         st.plotly_chart(fig_f, use_container_width=True)
 
 # TAB 3: 공매도 시계열 분석
-with tab3:
+@traced('render.short_timeseries')
+def render_short_timeseries_tab():
     st.header("📈 공매도 시계열 분석 (60일)")
     
     if show_timeseries:
-        # 시계열 데이터 준비
-        timeseries_data = {}
-        for ticker in selected_tickers:
-            if ticker in df_results['Ticker'].values:
-                idx = df_results[df_results['Ticker'] == ticker].index[0]
-                hist_data = df_results.loc[idx, 'finra_historical']
-                if hist_data is not None and not hist_data.empty:
-                    timeseries_data[ticker] = hist_data
+        # 시계열 데이터 준비 (날짜 × 종목 패널로 한 번 잘라 이동평균/변동성/상관계수를 일괄 계산)
+        short_matrix = finra_store.matrix(published_trading_days(60), fetch=scheduler is None)
+        panel = short_ratio_panel(short_matrix, [t for t in selected_tickers if t in df_results['Ticker'].values])
+        ratio_panel = panel['short_ratio']
         
-        if timeseries_data:
+        if not ratio_panel.empty:
             # 차트 A: 전체 종목 추세 비교
             st.subheader("📊 전체 종목 공매도 비율 추세")
             st.caption("💡 **60일간의 일일 공매도 거래 비율 변화** - 추세선이 상승하면 공매도 압력 증가, 하락하면 감소")
             
-            fig_ts_all = go.Figure()
-            colors_ts = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#FFA07A', '#98D8C8', '#F7DC6F', '#BB8FCE', '#E74C3C', '#3498DB']
-            
-            for idx, (ticker, df_ts) in enumerate(timeseries_data.items()):
-                df_ts_sorted = df_ts.sort_values('date')
-                
-                fig_ts_all.add_trace(go.Scatter(
-                    x=pd.to_datetime(df_ts_sorted['date']),
-                    y=df_ts_sorted['short_ratio'],
-                    mode='lines+markers',
-                    name=ticker,
-                    line=dict(width=2.5, color=colors_ts[idx % len(colors_ts)]),
-                    marker=dict(size=6),
-                    hovertemplate='<b>%{fullData.name}</b><br>날짜: %{x|%Y-%m-%d}<br>공매도 비율: %{y:.1f}%<extra></extra>'
-                ))
-            
-            fig_ts_all.add_hline(y=40, line_dash="dash", line_color="gray", annotation_text="정상 범위 (40%)")
-            fig_ts_all.add_hline(y=50, line_dash="dash", line_color="red", annotation_text="약세 압력 (50%)")
-            
-            fig_ts_all.update_layout(
-                xaxis_title='날짜',
-                yaxis_title='공매도 거래 비율 (%)',
-                hovermode='x unified',
-                height=600,
-                template='plotly_white',
-                legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
-            )
+            fig_ts_all = figure_cache.get_or_build('ts_all', charts.ts_all, ratio_panel)
             
             st.plotly_chart(fig_ts_all, use_container_width=True)
             
@@ -789,66 +574,10 @@ with tab3:
             st.subheader("📊 개별 종목 상세 시계열 (7일 이동평균 포함)")
             st.caption("💡 **종목별 공매도 추세 분석** - 빨간 점선(7일 이동평균)이 상승하면 공매도 압력 증가 추세")
             
-            # 3x3 그리드
-            n_tickers = len(selected_tickers)
-            n_cols = 3
-            n_rows = (n_tickers + n_cols - 1) // n_cols
-            
-            fig_ts_individual = make_subplots(
-                rows=n_rows, cols=n_cols,
-                subplot_titles=[ticker for ticker in selected_tickers],
-                vertical_spacing=0.10,
-                horizontal_spacing=0.08
-            )
-            
-            for idx, ticker in enumerate(selected_tickers):
-                row = idx // n_cols + 1
-                col = idx % n_cols + 1
-                
-                if ticker in timeseries_data:
-                    df_ts = timeseries_data[ticker]
-                    df_ts_sorted = df_ts.sort_values('date')
-                    
-                    # 공매도 비율 라인
-                    fig_ts_individual.add_trace(
-                        go.Scatter(
-                            x=pd.to_datetime(df_ts_sorted['date']),
-                            y=df_ts_sorted['short_ratio'],
-                            mode='lines',
-                            name=ticker,
-                            line=dict(width=2, color=colors_ts[idx % len(colors_ts)]),
-                            fill='tozeroy',
-                            fillcolor=f'rgba({int(colors_ts[idx % len(colors_ts)][1:3], 16)}, {int(colors_ts[idx % len(colors_ts)][3:5], 16)}, {int(colors_ts[idx % len(colors_ts)][5:7], 16)}, 0.2)',
-                            showlegend=False,
-                            hovertemplate='%{y:.1f}%<extra></extra>'
-                        ),
-                        row=row, col=col
-                    )
-                    
-                    # 이동평균선 (7일)
-                    if len(df_ts_sorted) >= 7:
-                        ma7 = df_ts_sorted['short_ratio'].rolling(window=7).mean()
-                        fig_ts_individual.add_trace(
-                            go.Scatter(
-                                x=pd.to_datetime(df_ts_sorted['date']),
-                                y=ma7,
-                                mode='lines',
-                                name=f'{ticker} MA7',
-                                line=dict(width=1.5, color='red', dash='dash'),
-                                showlegend=False,
-                                hovertemplate='MA7: %{y:.1f}%<extra></extra>'
-                            ),
-                            row=row, col=col
-                        )
-            
-            fig_ts_individual.update_xaxes(title_text="날짜")
-            fig_ts_individual.update_yaxes(title_text="공매도 비율 (%)")
+            # 3열 그리드
+            ma_panel = panel['ma']
             
-            fig_ts_individual.update_layout(
-                height=300 * n_rows,
-                template='plotly_white',
-                showlegend=False
-            )
+            fig_ts_individual = figure_cache.get_or_build('ts_individual', charts.ts_individual, ratio_panel, ma_panel, selected_tickers)
             
             st.plotly_chart(fig_ts_individual, use_container_width=True)
             
@@ -859,36 +588,16 @@ with tab3:
                 st.subheader("📊 거래량 vs 공매도 비율 관계 (최근 30일)")
                 st.caption("💡 **거래량이 많을 때 공매도도 증가하는지 확인** - 버블 크기는 공매도 거래량을 나타냄")
                 
-                all_ts_data = []
-                for ticker, df_ts in timeseries_data.items():
-                    df_temp = df_ts.copy()
-                    df_temp['ticker'] = ticker
-                    all_ts_data.append(df_temp)
+                df_recent = panel['recent']
                 
-                if all_ts_data:
-                    df_all_ts = pd.concat(all_ts_data, ignore_index=True)
-                    df_all_ts['date'] = pd.to_datetime(df_all_ts['date'])
-                    
-                    recent_date = df_all_ts['date'].max() - timedelta(days=30)
-                    df_recent = df_all_ts[df_all_ts['date'] >= recent_date]
-                    
-                    fig_vol_short = px.scatter(
-                        df_recent,
-                        x='total_volume',
-                        y='short_ratio',
-                        color='ticker',
-                        size='short_volume',
-                        hover_data=['date'],
-                        labels={
-                            'total_volume': '전체 거래량',
-                            'short_ratio': '공매도 비율 (%)',
-                            'ticker': '종목'
-                        },
-                        color_discrete_sequence=colors_ts
-                    )
-                    
-                    fig_vol_short.update_layout(height=600, template='plotly_white')
+                if not df_recent.empty:
+                    fig_vol_short = figure_cache.get_or_build('volume_vs_short', charts.volume_vs_short, df_recent)
                     st.plotly_chart(fig_vol_short, use_container_width=True)
+                    
+                    correlation = panel['correlation'].dropna()
+                    if not correlation.empty:
+                        st.caption("거래량 ↔ 공매도 비율 상관계수 (최근 30일): " + ' · '.join(
+                            f"{ticker} {value:+.2f}" for ticker, value in correlation.items()))
             
             st.markdown("---")
             
@@ -897,44 +606,14 @@ with tab3:
                 st.subheader("📊 공매도 비율 변동성 분석 (Box Plot)")
                 st.caption("💡 **공매도 비율의 안정성 확인** - 박스가 작을수록 변동성이 낮아 안정적. 수염이 길면 극단값 존재")
                 
-                fig_volatility = go.Figure()
-                
-                for idx, ticker in enumerate(selected_tickers):
-                    if ticker in timeseries_data:
-                        df_ts = timeseries_data[ticker]
-                        
-                        fig_volatility.add_trace(go.Box(
-                            y=df_ts['short_ratio'],
-                            name=ticker,
-                            marker_color=colors_ts[idx % len(colors_ts)],
-                            boxmean='sd'
-                        ))
-                
-                fig_volatility.update_layout(
-                    yaxis_title='공매도 비율 (%)',
-                    xaxis_title='종목',
-                    height=600,
-                    template='plotly_white',
-                    showlegend=False
-                )
+                fig_volatility = figure_cache.get_or_build('volatility_box', charts.volatility_box, ratio_panel, selected_tickers)
                 
                 st.plotly_chart(fig_volatility, use_container_width=True)
                 
-                # 변동성 통계
-                volatility_data = []
-                for ticker, df_ts in timeseries_data.items():
-                    if len(df_ts) > 1:
-                        volatility_data.append({
-                            'Ticker': ticker,
-                            'Avg_Short_Ratio': df_ts['short_ratio'].mean(),
-                            'Std_Dev': df_ts['short_ratio'].std(),
-                            'Min': df_ts['short_ratio'].min(),
-                            'Max': df_ts['short_ratio'].max(),
-                            'Range': df_ts['short_ratio'].max() - df_ts['short_ratio'].min()
-                        })
+                # 변동성 통계 (패널에서 종목 전체를 한 번에 집계)
+                df_volatility = panel['stats']
                 
-                if volatility_data:
-                    df_volatility = pd.DataFrame(volatility_data)
+                if not df_volatility.empty:
                     st.markdown("##### 📊 변동성 통계")
                     st.dataframe(df_volatility.round(2), use_container_width=True, hide_index=True)
                     
@@ -942,6 +621,8 @@ with tab3:
                     **💡 해석:**
                     - **Std_Dev (표준편차)**: 높을수록 변동성이 큼
                     - **Range (범위)**: 최대-최소 차이, 높을수록 불안정
+                    - **P25 / Median / P75**: 60일 공매도 비율 분위수 (박스의 아래/가운데/위)
+                    - **Rolling_Std_7d**: 최근 7거래일 표준편차, Std_Dev보다 크면 최근 변동성 확대
                     - **변동성이 낮고 평균이 40% 미만이면 안정적**
                     """)
         else:
@@ -950,7 +631,8 @@ with tab3:
         st.info("사이드바에서 '시계열 분석 차트'를 활성화하세요.")
 
 # TAB 4: 고급 분석
-with tab4:
+@traced('render.advanced')
+def render_advanced_tab():
     st.header("🎯 고급 분석")
     
     # 차트 G: YF vs FINRA 상관관계
@@ -961,34 +643,7 @@ with tab4:
     - **FINRA Daily %**: 일일 공매도 거래 비율 (신규 거래, 매일 업데이트)
     - 오른쪽 상단에 위치할수록 공매도 압력이 강함
     """)
-    fig_correlation = go.Figure()
-    
-    fig_correlation.add_trace(go.Scatter(
-        x=df_results['short_percent_float'],
-        y=df_results['daily_short_ratio'],
-        mode='markers+text',
-        text=df_results['Ticker'],
-        textposition='top center',
-        marker=dict(
-            size=df_results['shares_short_millions'] / 10,
-            color=df_results['short_change_pct'],
-            colorscale='RdYlGn_r',
-            showscale=True,
-            colorbar=dict(title="MoM<br>변화율")
-        ),
-        hovertemplate='<b>%{text}</b><br>YF Short: %{x:.2f}%<br>FINRA Daily: %{y:.1f}%<extra></extra>'
-    ))
-    
-    fig_correlation.add_hline(y=40, line_dash="dash", line_color="gray", annotation_text="FINRA 정상선 (40%)")
-    fig_correlation.add_vline(x=2, line_dash="dash", line_color="gray", annotation_text="YF 매우건강 (2%)")
-    fig_correlation.add_vline(x=5, line_dash="dash", line_color="orange", annotation_text="YF 건강선 (5%)")
-    
-    fig_correlation.update_layout(
-        xaxis_title='Yahoo Finance: Short % of Float',
-        yaxis_title='FINRA: Daily Short Volume %',
-        height=600,
-        template='plotly_white'
-    )
+    fig_correlation = figure_cache.get_or_build('yf_vs_finra', charts.yf_vs_finra, df_results)
     
     st.plotly_chart(fig_correlation, use_container_width=True)
     
@@ -1011,54 +666,16 @@ with tab4:
     - Change Score: 전월 대비 변화 (감소할수록 높은 점수)
     """)
     
-    # 정규화 함수
-    def normalize_inverse(values, max_val):
-        return np.clip(100 - (values / max_val * 100), 0, 100)
-    
-    # 정규화
-    norm_short_pct = normalize_inverse(df_results['short_percent_float'], 10)
-    norm_days = normalize_inverse(df_results['short_ratio_days'], 5)
-    norm_finra_daily = normalize_inverse(df_results['daily_short_ratio'], 60)
-    norm_change = np.clip(50 - df_results['short_change_pct'] * 2, 0, 100)
-    
-    # 종합 점수
-    comprehensive_score = (norm_short_pct + norm_days + norm_finra_daily + norm_change) / 4
-    
-    fig_comprehensive = go.Figure()
-    
-    colors_comp = ['green' if x > 70 else 'orange' if x > 50 else 'red' for x in comprehensive_score]
-    
-    fig_comprehensive.add_trace(go.Bar(
-        x=df_results['Ticker'],
-        y=comprehensive_score,
-        marker=dict(color=colors_comp),
-        text=comprehensive_score.round(1),
-        textposition='auto',
-        hovertemplate='<b>%{x}</b><br>종합 점수: %{y:.1f}/100<extra></extra>'
-    ))
-    
-    fig_comprehensive.add_hline(y=70, line_dash="dash", line_color="green", annotation_text="우수 (70점)")
-    fig_comprehensive.add_hline(y=50, line_dash="dash", line_color="orange", annotation_text="보통 (50점)")
-    
-    fig_comprehensive.update_layout(
-        xaxis_title='종목',
-        yaxis_title='종합 점수 (점)',
-        height=450,
-        template='plotly_white',
-        showlegend=False
-    )
+    # 4개 지표를 0-100점으로 정규화한 점수와 평균 (scoring.py)
+    pressure_scores = short_pressure_scores(df_results)
+    comprehensive_score = pressure_scores['Total_Score']
+    
+    fig_comprehensive = figure_cache.get_or_build('comprehensive_score', charts.comprehensive_score, df_results, comprehensive_score)
     
     st.plotly_chart(fig_comprehensive, use_container_width=True)
     
     # 점수 상세 테이블
-    score_detail = pd.DataFrame({
-        'Ticker': df_results['Ticker'],
-        'Short%_Score': norm_short_pct.round(1),
-        'Days_Score': norm_days.round(1),
-        'FINRA_Score': norm_finra_daily.round(1),
-        'Change_Score': norm_change.round(1),
-        'Total_Score': comprehensive_score.round(1)
-    })
+    score_detail = pd.concat([df_results['Ticker'], pressure_scores.round(1)], axis=1)
     
     st.markdown("##### 📊 공매도 종합 점수 상세")
     
@@ -1153,7 +770,8 @@ with tab4:
     """)
 
 # TAB 5: 데이터
-with tab5:
+@traced('render.data')
+def render_data_tab():
     st.header("📋 전체 데이터")
     
     # 최종 요약표
@@ -1248,6 +866,42 @@ with tab5:
     - Days to Cover 3일 이상: 변동성 증가 가능
     """)
 
+# TAB 6: 전체 종목 공매도 스크리너
+@traced('render.screener')
+def render_screener_tab():
+    st.header("🔎 전체 종목 공매도 스크리너")
+    st.caption("💡 **FINRA 일별 파일에 포함된 모든 종목을 한 번에 계산** - 공매도 비율, 이동평균, 전일 대비 변화 기준 순위")
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        screen_top_n = st.slider("상위 종목 수", 10, 200, 50, step=10)
+    with col2:
+        screen_window = st.slider("이동평균 기간 (거래일)", 3, 20, 5)
+    with col3:
+        screen_min_volume = st.number_input("최소 거래량", min_value=0, value=1_000_000, step=100_000)
+    with col4:
+        screen_sort_labels = {
+            '최근일 공매도 비율': 'short_ratio',
+            f'{screen_window}일 평균 공매도 비율': f'avg_short_ratio_{screen_window}d',
+            '전일 대비 변화': 'change_1d',
+        }
+        screen_sort = st.selectbox("정렬 기준", list(screen_sort_labels.keys()))
+    
+    df_screen = get_short_volume_screen(60, screen_top_n, screen_window, int(screen_min_volume), screen_sort_labels[screen_sort], as_of)
+    
+    if df_screen.empty:
+        st.warning("스크리닝할 FINRA 데이터가 없습니다.")
+    else:
+        st.markdown(f"**기준일:** {df_screen['latest_date'].iloc[0]} | **표시 종목:** {len(df_screen)}개")
+        st.dataframe(df_screen.drop(columns=['latest_date']), use_container_width=True, hide_index=True)
+
+# 선택한 탭만 계산/렌더링
+TAB_RENDERERS = dict(zip(TAB_LABELS, [
+    render_dashboard_tab, render_short_basic_tab, render_short_timeseries_tab,
+    render_advanced_tab, render_data_tab, render_screener_tab,
+]))
+TAB_RENDERERS[active_tab]()
+
 # 푸터
 st.markdown("---")
 st.markdown(
@@ -1257,3 +911,59 @@ st.markdown(
     "</div>", 
     unsafe_allow_html=True
 )
+
+# ==================== 성능 패널 ====================
+# 이번 실행까지 누적된 구간별 측정값 (탭 렌더링 포함을 위해 마지막에 그림)
+if show_perf:
+    with st.sidebar:
+        st.markdown("---")
+        st.subheader("⏱️ 성능")
+        perf_rows = tracer.stats()
+        if perf_rows:
+            df_perf = pd.DataFrame(perf_rows)
+            df_perf = pd.DataFrame({
+                '구간': df_perf['stage'],
+                '호출': df_perf['count'],
+                '평균(ms)': (df_perf['avg_s'] * 1000).round(1),
+                '최근(ms)': (df_perf['last_s'] * 1000).round(1),
+                '최대(ms)': (df_perf['max_s'] * 1000).round(1),
+                'KB': (df_perf['bytes'] / 1024).round(0),
+                '적중': df_perf['cache_hits'],
+                '미스': df_perf['cache_misses'],
+                '재시도': df_perf['retries'],
+                '오류': df_perf['errors'],
+            }).sort_values('최근(ms)', ascending=False)
+            st.dataframe(df_perf, use_container_width=True, hide_index=True)
+        st.caption(f"집계 시작: {tracer.started_at.strftime('%Y-%m-%d %H:%M:%S')}")
+        
+        cache_rows = tracer.cache_stats()
+        if cache_rows:
+            df_cache = pd.DataFrame(cache_rows)
+            st.dataframe(pd.DataFrame({
+                '캐시': df_cache['cache'],
+                '항목': df_cache['entries'],
+                '사용(MB)': (df_cache['bytes'] / 2**20).round(1),
+                '상한(MB)': (df_cache['max_bytes'] / 2**20).round(0),
+                '적중': df_cache['hits'],
+                '미스': df_cache['misses'],
+                '제거': df_cache['evictions'],
+            }), use_container_width=True, hide_index=True)
+        
+        # negative 캐시 / single-flight / 공유 캐시 카운터 (숫자 필드만 요약)
+        counter_rows = tracer.counter_stats()
+        if counter_rows:
+            st.dataframe(pd.DataFrame([{
+                '계층': row['kind'],
+                '이름': row['name'],
+                '값': ' · '.join(f"{k}={v}" for k, v in row.items()
+                                 if k not in ('kind', 'name') and isinstance(v, (int, float))),
+            } for row in counter_rows]), use_container_width=True, hide_index=True)
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button("JSON", tracer.to_json(), file_name="perf_trace.json", mime="application/json")
+        with col2:
+            st.download_button("Prometheus", tracer.to_prometheus(), file_name="perf_trace.prom", mime="text/plain")
+        if st.button("측정값 초기화"):
+            tracer.reset()
+            st.rerun()
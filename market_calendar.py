@@ -0,0 +1,112 @@
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+# ==================== 미국 증시 거래일 캘린더 ====================
+# 네트워크 없이 규칙으로 NYSE 휴장일 계산 (FINRA 파일도 거래일에만 게시)
+MARKET_TZ = ZoneInfo('America/New_York')
+
+# FINRA Reg SHO 일별 파일 게시 시각 (동부시간, 거래일 당일 저녁)
+FINRA_PUBLISH_TIME = time(18, 0)
+
+# 정규장 시간 (조기 폐장일은 구분하지 않음)
+MARKET_OPEN = time(9, 30)
+MARKET_CLOSE = time(16, 0)
+
+# 규칙에 없는 임시 휴장일 (국가 애도일 등)
+SPECIAL_CLOSURES = {
+    date(2012, 10, 29), date(2012, 10, 30),  # 허리케인 샌디
+    date(2018, 12, 5),                       # 조지 H.W. 부시 애도일
+    date(2025, 1, 9),                        # 지미 카터 애도일
+}
+
+
+def _nth_weekday(year, month, weekday, n):
+    first = date(year, month, 1)
+    return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+
+
+def _last_weekday(year, month, weekday):
+    last = date(year, month + 1, 1) - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _easter(year):
+    # Anonymous Gregorian algorithm
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def _observed(holiday):
+    # 토요일 → 금요일, 일요일 → 월요일
+    if holiday.weekday() == 5:
+        return holiday - timedelta(days=1)
+    if holiday.weekday() == 6:
+        return holiday + timedelta(days=1)
+    return holiday
+
+
+@lru_cache(maxsize=None)
+def nyse_holidays(year):
+    holidays = {
+        _nth_weekday(year, 1, 0, 3),              # Martin Luther King Jr. Day
+        _nth_weekday(year, 2, 0, 3),              # Presidents' Day
+        _easter(year) - timedelta(days=2),        # Good Friday
+        _last_weekday(year, 5, 0),                # Memorial Day
+        _observed(date(year, 7, 4)),              # Independence Day
+        _nth_weekday(year, 9, 0, 1),              # Labor Day
+        _nth_weekday(year, 11, 3, 4),             # Thanksgiving
+        _observed(date(year, 12, 25)),            # Christmas
+    }
+    # 신정이 토요일이면 전년도 12/31은 휴장하지 않음
+    new_year = date(year, 1, 1)
+    if new_year.weekday() != 5:
+        holidays.add(_observed(new_year))
+    if year >= 2022:
+        holidays.add(_observed(date(year, 6, 19)))  # Juneteenth
+    holidays |= {d for d in SPECIAL_CLOSURES if d.year == year}
+    return frozenset(holidays)
+
+
+def is_trading_day(day):
+    return day.weekday() < 5 and day not in nyse_holidays(day.year)
+
+
+def published_trading_days(n, now=None, publish_time=FINRA_PUBLISH_TIME):
+    """FINRA 파일이 이미 게시된 최근 n개 거래일(YYYYMMDD)을 최신순으로 반환"""
+    now = now.astimezone(MARKET_TZ) if now else datetime.now(MARKET_TZ)
+    day = now.date()
+    # 당일 파일은 게시 시각 이후부터 조회
+    if now.time() < publish_time:
+        day -= timedelta(days=1)
+
+    sessions = []
+    while len(sessions) < n:
+        if is_trading_day(day):
+            sessions.append(day.strftime('%Y%m%d'))
+        day -= timedelta(days=1)
+    return sessions
+
+
+def is_market_open(now=None):
+    now = now.astimezone(MARKET_TZ) if now else datetime.now(MARKET_TZ)
+    return is_trading_day(now.date()) and MARKET_OPEN <= now.time() < MARKET_CLOSE
+
+
+def last_session_close(now=None):
+    """가장 최근에 끝난 정규장의 마감 시각 (동부시간)"""
+    now = now.astimezone(MARKET_TZ) if now else datetime.now(MARKET_TZ)
+    day = now.date()
+    if now.time() < MARKET_CLOSE:
+        day -= timedelta(days=1)
+    while not is_trading_day(day):
+        day -= timedelta(days=1)
+    return datetime.combine(day, MARKET_CLOSE, tzinfo=MARKET_TZ)
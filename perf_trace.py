@@ -0,0 +1,283 @@
+import functools
+import json
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# ==================== 구간별 성능 추적 ====================
+# 수집 함수/탭 렌더링 단위로 소요 시간, 다운로드 바이트, 캐시 적중, HTTP 재시도를 기록
+# (Streamlit 의존 없음, 프로세스 단위 누적)
+
+
+class Span:
+    def __init__(self, name, cache=None):
+        self.name = name
+        self.cache = cache
+        self.hits = 0
+        self.misses = 0
+        self.bytes = 0
+        self.retries = 0
+        self.error = None
+        self.started = time.perf_counter()
+        self.seconds = 0.0
+
+    def add(self, bytes=0, retries=0, hits=0, misses=0):
+        self.bytes += bytes
+        self.retries += retries
+        self.hits += hits
+        self.misses += misses
+
+    def fail(self, error):
+        self.error = repr(error) if not isinstance(error, str) else error
+
+
+class Tracer:
+    def __init__(self, recent=200):
+        self._stats = {}
+        self._recent = deque(maxlen=recent)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._caches = {}
+        self._counters = {}
+        self.started_at = datetime.now()
+
+    def current(self):
+        stack = getattr(self._local, 'stack', None)
+        return stack[-1] if stack else None
+
+    def span(self, name, cache=None):
+        return _SpanContext(self, name, cache)
+
+    def _finish(self, span):
+        # 캐시 계층 span은 하나의 적중/미스로 집계, 나머지는 span 안에서 직접 더한 값을 집계
+        if span.cache == 'hit':
+            span.hits += 1
+        elif span.cache == 'miss':
+            span.misses += 1
+        with self._lock:
+            stat = self._stats.setdefault(span.name, {
+                'count': 0, 'errors': 0, 'total_s': 0.0, 'max_s': 0.0, 'last_s': 0.0,
+                'bytes': 0, 'cache_hits': 0, 'cache_misses': 0, 'retries': 0,
+            })
+            stat['count'] += 1
+            stat['errors'] += span.error is not None
+            stat['total_s'] += span.seconds
+            stat['max_s'] = max(stat['max_s'], span.seconds)
+            stat['last_s'] = span.seconds
+            stat['bytes'] += span.bytes
+            stat['cache_hits'] += span.hits
+            stat['cache_misses'] += span.misses
+            stat['retries'] += span.retries
+            self._recent.append({
+                'name': span.name, 'at': datetime.now().isoformat(timespec='seconds'),
+                'seconds': round(span.seconds, 6), 'bytes': span.bytes, 'hits': span.hits,
+                'misses': span.misses, 'retries': span.retries, 'error': span.error,
+            })
+
+    def traced(self, name):
+        """함수 호출 전체를 하나의 span으로 기록하는 데코레이터"""
+        def decorate(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def traced_cache(self, name, cache_decorator):
+        """캐시 데코레이터(st.cache_data 등)를 감싸 호출 시간과 적중/미스를 기록
+
+        본문이 실제로 실행되면 미스, 아니면 적중. .clear 등 캐시 메서드는 그대로 노출
+        """
+        def decorate(func):
+            @functools.wraps(func)
+            def compute(*args, **kwargs):
+                span = self.current()
+                if span is not None and span.name == name:
+                    span.cache = 'miss'
+                return func(*args, **kwargs)
+
+            cached = cache_decorator(compute)
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(name, cache='hit'):
+                    return cached(*args, **kwargs)
+
+            for attr in ('clear',):
+                if hasattr(cached, attr):
+                    setattr(wrapper, attr, getattr(cached, attr))
+            return wrapper
+        return decorate
+
+    def stats(self):
+        with self._lock:
+            rows = []
+            for name, stat in sorted(self._stats.items()):
+                row = {'stage': name, **stat}
+                row['avg_s'] = stat['total_s'] / stat['count'] if stat['count'] else 0.0
+                rows.append(row)
+            return rows
+
+    def register_cache(self, name, stats_fn):
+        """크기 제한 캐시의 상태(stats_fn() → dict)를 성능 패널/메트릭에 함께 노출"""
+        with self._lock:
+            self._caches[name] = stats_fn
+
+    def cache_stats(self):
+        with self._lock:
+            caches = dict(self._caches)
+        return [{'cache': name, **stats_fn()} for name, stats_fn in sorted(caches.items())]
+
+    def register_counters(self, kind, name, stats_fn, totals=()):
+        """negative 캐시/single-flight/공유 캐시 등 보조 계층의 카운터(stats_fn() → dict)를 노출
+
+        totals에 든 필드는 누적 카운터(Prometheus counter), 나머지 숫자 필드는 현재 값(gauge)
+        """
+        with self._lock:
+            self._counters[(kind, name)] = (stats_fn, tuple(totals))
+
+    def counter_stats(self):
+        with self._lock:
+            counters = dict(self._counters)
+        return [{'kind': kind, 'name': name, **stats_fn()}
+                for (kind, name), (stats_fn, _) in sorted(counters.items())]
+
+    def recent(self):
+        with self._lock:
+            return list(self._recent)
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self._recent.clear()
+            self.started_at = datetime.now()
+
+    def to_json(self):
+        return json.dumps({
+            'since': self.started_at.isoformat(timespec='seconds'),
+            'stages': self.stats(),
+            'caches': self.cache_stats(),
+            'counters': self.counter_stats(),
+            'recent': self.recent(),
+        }, ensure_ascii=False, indent=2)
+
+    def to_prometheus(self, prefix='short_dashboard'):
+        """Prometheus 텍스트 노출 형식 (stage 라벨별 카운터)"""
+        metrics = [
+            ('stage_calls_total', 'counter', 'count', '구간 실행 횟수'),
+            ('stage_errors_total', 'counter', 'errors', '예외/실패로 끝난 실행 횟수'),
+            ('stage_seconds_total', 'counter', 'total_s', '누적 소요 시간(초)'),
+            ('stage_seconds_max', 'gauge', 'max_s', '최대 소요 시간(초)'),
+            ('stage_bytes_total', 'counter', 'bytes', '다운로드 바이트'),
+            ('stage_cache_hits_total', 'counter', 'cache_hits', '캐시 적중'),
+            ('stage_cache_misses_total', 'counter', 'cache_misses', '캐시 미스'),
+            ('stage_retries_total', 'counter', 'retries', 'HTTP 재시도'),
+        ]
+        rows = self.stats()
+        lines = []
+        for metric, kind, field, help_text in metrics:
+            lines.append(f"# HELP {prefix}_{metric} {help_text}")
+            lines.append(f"# TYPE {prefix}_{metric} {kind}")
+            for row in rows:
+                stage = row['stage'].replace('\\', '\\\\').replace('"', '\\"')
+                lines.append(f'{prefix}_{metric}{{stage="{stage}"}} {row[field]}')
+
+        cache_metrics = [
+            ('cache_hits_total', 'counter', 'hits', '캐시 적중'),
+            ('cache_misses_total', 'counter', 'misses', '캐시 미스'),
+            ('cache_evictions_total', 'counter', 'evictions', '용량 초과로 제거된 항목'),
+            ('cache_resident_bytes', 'gauge', 'bytes', '캐시에 보관 중인 바이트'),
+            ('cache_max_bytes', 'gauge', 'max_bytes', '캐시 메모리 상한'),
+            ('cache_entries', 'gauge', 'entries', '캐시 항목 수'),
+        ]
+        cache_rows = self.cache_stats()
+        for metric, kind, field, help_text in cache_metrics if cache_rows else []:
+            lines.append(f"# HELP {prefix}_{metric} {help_text}")
+            lines.append(f"# TYPE {prefix}_{metric} {kind}")
+            for row in cache_rows:
+                lines.append(f'{prefix}_{metric}{{cache="{row["cache"]}"}} {row[field]}')
+
+        with self._lock:
+            totals = {key: fields for key, (_, fields) in self._counters.items()}
+        samples = {}
+        for row in self.counter_stats():
+            for field, value in row.items():
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                total = field in totals.get((row['kind'], row['name']), ())
+                metric = f"{row['kind']}_{field}" + ('_total' if total else '')
+                samples.setdefault((metric, 'counter' if total else 'gauge'), []).append((row['name'], value))
+        for (metric, kind), values in sorted(samples.items()):
+            lines.append(f"# TYPE {prefix}_{metric} {kind}")
+            for name, value in values:
+                lines.append(f'{prefix}_{metric}{{name="{name}"}} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+class _SpanContext:
+    def __init__(self, tracer, name, cache):
+        self.tracer = tracer
+        self.span = Span(name, cache)
+
+    def __enter__(self):
+        stack = getattr(self.tracer._local, 'stack', None)
+        if stack is None:
+            stack = self.tracer._local.stack = []
+        self.span.started = time.perf_counter()
+        stack.append(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        self.span.seconds = time.perf_counter() - self.span.started
+        if exc is not None and self.span.error is None:
+            self.span.fail(exc)
+        self.tracer._local.stack.pop()
+        self.tracer._finish(self.span)
+        return False
+
+
+tracer = Tracer()
+span = tracer.span
+traced = tracer.traced
+traced_cache = tracer.traced_cache
+
+
+# ==================== Prometheus 스크레이프 엔드포인트 ====================
+_metrics_server = None
+
+
+def serve_metrics(port, host='127.0.0.1'):
+    """GET /metrics (Prometheus 텍스트), GET /metrics.json 을 제공하는 백그라운드 서버 (프로세스당 한 번만 시작)
+
+    대시보드 비밀번호 확인 밖에서 실패 URL/오류 문자열까지 노출하므로 기본은 로컬 전용.
+    외부 수집기가 직접 가져가야 하면 host='0.0.0.0' 등을 명시적으로 지정
+    """
+    global _metrics_server
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == '/metrics':
+                body, content_type = tracer.to_prometheus(), 'text/plain; version=0.0.4; charset=utf-8'
+            elif self.path == '/metrics.json':
+                body, content_type = tracer.to_json(), 'application/json; charset=utf-8'
+            else:
+                self.send_error(404)
+                return
+            payload = body.encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    with tracer._lock:
+        if _metrics_server is None:
+            _metrics_server = ThreadingHTTPServer((host, port), Handler)
+            threading.Thread(target=_metrics_server.serve_forever, daemon=True).start()
+    return _metrics_server
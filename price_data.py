@@ -0,0 +1,360 @@
+import os
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+from cache_utils import NegativeCache, SingleFlight, SizedLRUCache
+from perf_trace import span, traced
+from shared_cache import shared_cache
+
+# ==================== Yahoo 가격 데이터 ====================
+PRICE_FIELDS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+# 조회 실패한 티커 기록 (키: "prices:TICKER", "info:TICKER")
+yahoo_misses = NegativeCache(ttl=600, name='yahoo')
+# 세션 간 동시 .info 요청 병합 (키: (티커, refresh))
+info_flights = SingleFlight('yahoo.info')
+# 가격 누적기 메모리 상한 (임의 종목 입력 시 무한히 늘지 않도록, 초과 시 오래 안 쓴 종목부터 제거)
+PRICE_CACHE_MAX_MB = float(os.environ.get('PRICE_CACHE_MAX_MB', '256'))
+
+
+@traced('yahoo.history')
+def load_price_panel(tickers, start, end=None):
+    """yf.download 한 번으로 여러 종목의 OHLCV를 (필드, 티커) 컬럼의 wide DataFrame으로 반환"""
+    tickers = list(tickers)
+    panel = yf.download(
+        tickers, start=start, end=end,
+        auto_adjust=True, group_by='column', threads=True, progress=False,
+    )
+    if panel is None or panel.empty:
+        return pd.DataFrame(columns=pd.MultiIndex.from_product([PRICE_FIELDS, tickers]))
+    if not isinstance(panel.columns, pd.MultiIndex):
+        panel.columns = pd.MultiIndex.from_product([panel.columns, tickers[:1]])
+    return panel
+
+
+def split_panel(panel, tickers):
+    """wide 패널을 한 번에 (봉, 필드, 종목) 배열로 바꿔 종목별 봉 묶음 (DatetimeIndex, OHLCV 배열, 필드)으로 나눔
+
+    종목마다 xs/dropna로 DataFrame을 만들지 않으므로 새 봉 1~2개짜리 증분 갱신은 종목 수가 늘어도 가벼움
+    모든 필드가 비어 있는 봉(상장 전/거래 없는 날)은 제외
+    """
+    tickers = list(tickers)
+    present = set(panel.columns.get_level_values(0))
+    fields = [f for f in PRICE_FIELDS if f in present]
+    columns = pd.MultiIndex.from_product([fields, tickers])
+    cube = panel.reindex(columns=columns).to_numpy(dtype='float64').reshape(len(panel), len(fields), len(tickers))
+    bars = {}
+    for j, ticker in enumerate(tickers):
+        prices = cube[:, :, j]
+        observed = ~np.isnan(prices).all(axis=1)
+        bars[ticker] = ((panel.index, prices) if observed.all()
+                        else (panel.index[observed], prices[observed])) + (fields,)
+    return bars
+
+
+def frame_bars(df):
+    """한 종목 OHLCV DataFrame(공유 캐시 값) → 봉 묶음"""
+    fields = [c for c in PRICE_FIELDS if c in df.columns]
+    return df.index, df[fields].to_numpy(dtype='float64'), fields
+
+
+def bars_frame(bars):
+    """봉 묶음 → 한 종목 OHLCV DataFrame (yf.Ticker.history와 같은 모양, 공유 캐시 저장용)"""
+    index, prices, fields = bars
+    return pd.DataFrame(prices, index=index, columns=fields)
+
+
+# ==================== 증분 Anchored VWAP ====================
+VWAP_COLUMNS = ['Typical_Price', 'TP_Volume', 'Cumulative_TP_Volume', 'Cumulative_Volume', 'Anchored_VWAP']
+
+
+def _vwap_rows(prices, fields, cum_tp_volume=0.0, cum_volume=0.0):
+    """새 봉들의 (OHLCV + VWAP 컬럼) 2차원 배열 (이전 봉들의 누적합을 이어받아 새 봉만 계산)"""
+    high, low, close, volume = (prices[:, fields.index(f)] for f in ('High', 'Low', 'Close', 'Volume'))
+    typical_price = (high + low + close) / 3
+    tp_volume = typical_price * volume
+    cumulative_tp_volume = cum_tp_volume + np.cumsum(tp_volume)
+    cumulative_volume = cum_volume + np.cumsum(volume)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        anchored_vwap = cumulative_tp_volume / cumulative_volume
+    return np.column_stack([prices, typical_price, tp_volume, cumulative_tp_volume, cumulative_volume, anchored_vwap])
+
+
+def _as_index_time(ts, index):
+    # yfinance 인덱스가 tz-aware인 경우 앵커 시각도 같은 타임존으로 맞춤
+    ts = pd.Timestamp(ts)
+    if getattr(index, 'tz', None) is not None and ts.tzinfo is None:
+        return ts.tz_localize(index.tz)
+    return ts
+
+
+class AnchoredVWAPAccumulator:
+    """(티커, 앵커)별 TP×Volume / Volume 누적합을 유지하며 새 봉만 반영
+
+    봉은 미리 잡아 둔(용량 2배씩 증가) float64 배열 뒤에 이어 쓰고, 누적합은 마지막 행에서 바로 읽으므로
+    갱신 비용은 새 봉 수에 비례. DataFrame(frame)은 읽을 때 한 번 만들어 다음 갱신 전까지 재사용
+    """
+
+    def __init__(self, ticker, anchor):
+        self.ticker = ticker
+        self.anchor = anchor
+        self.fields = None
+        self.rows = 0
+        self._values = np.empty((0, 0))
+        self._index = np.empty(0, dtype='int64')  # UTC 기준 ns
+        self._tz = None
+        self._index_name = None
+        self._frame = pd.DataFrame()
+
+    @property
+    def last_timestamp(self):
+        if not self.rows:
+            return None
+        ts = pd.Timestamp(int(self._index[self.rows - 1]))
+        return ts.tz_localize('UTC').tz_convert(self._tz) if self._tz is not None else ts
+
+    @property
+    def nbytes(self):
+        """보관 중인 배열 + 만들어 둔 frame의 바이트 (전체를 다시 재지 않고 행 수로 계산)"""
+        frame_bytes = (self._values.shape[1] + 1) * 8 * len(self._frame) if self._frame is not None else 0
+        return self._values.nbytes + self._index.nbytes + frame_bytes
+
+    @property
+    def frame(self):
+        if self._frame is None:
+            index = pd.DatetimeIndex(self._index[:self.rows].view('datetime64[ns]'), name=self._index_name)
+            if self._tz is not None:
+                index = index.tz_localize('UTC').tz_convert(self._tz)
+            # 모든 호출 측이 같은 frame을 공유하므로 (ShortVolumeMatrix처럼) 데이터 배열은 쓰기 금지
+            # pandas 버전/copy-on-write 설정과 무관하게 제자리 수정은 ValueError, 컬럼 추가·연산 결과는 새 배열
+            values = self._values[:self.rows].copy()
+            values.flags.writeable = False
+            self._frame = pd.DataFrame(values, index=index, columns=self.fields + VWAP_COLUMNS, copy=False)
+        return self._frame
+
+    def update(self, bars):
+        """봉 묶음(split_panel/frame_bars)에서 앵커 이후, 마지막 봉(장중 미확정 봉, 다시 받아 교체) 이후 행만 이어 씀"""
+        index, prices, fields = bars
+        if not len(index):
+            return
+        # 시각 비교는 DataFrame 필터 대신 UTC ns 정수 배열로 (tz-aware 인덱스의 asi8/Timestamp.value 모두 UTC 기준)
+        stamps = index.as_unit('ns').asi8
+        start = _as_index_time(self.anchor, index).value
+        if self.rows:
+            start = max(start, int(self._index[self.rows - 1]))
+        keep = stamps >= start
+        if not keep.any():
+            return
+        if not keep.all():
+            stamps, prices = stamps[keep], prices[keep]
+
+        if self.fields is None:
+            self.fields = list(fields)
+            self._values = np.empty((0, len(self.fields) + len(VWAP_COLUMNS)))
+            self._tz = index.tz
+            self._index_name = index.name
+        if list(fields) != self.fields:
+            # 처음 받은 봉과 필드 구성이 다르면 누적기 컬럼 순서에 맞추고 없는 필드는 NaN
+            aligned = np.full((len(prices), len(self.fields)), np.nan)
+            for i, field in enumerate(self.fields):
+                if field in fields:
+                    aligned[:, i] = prices[:, fields.index(field)]
+            prices = aligned
+        if self.rows and stamps[0] <= self._index[self.rows - 1]:
+            self.rows -= 1
+
+        cum_tp_volume, cum_volume = self._values[self.rows - 1, -3:-1] if self.rows else (0.0, 0.0)
+        new_rows = _vwap_rows(prices, self.fields, cum_tp_volume, cum_volume)
+        end = self.rows + len(new_rows)
+        if end > len(self._values):
+            self._grow(end)
+        self._values[self.rows:end] = new_rows
+        self._index[self.rows:end] = stamps
+        self.rows = end
+        self._frame = None
+
+    def _grow(self, needed):
+        capacity = max(needed, 2 * len(self._values), 64)
+        values = np.empty((capacity, self._values.shape[1]))
+        values[:self.rows] = self._values[:self.rows]
+        index = np.empty(capacity, dtype='int64')
+        index[:self.rows] = self._index[:self.rows]
+        self._values, self._index = values, index
+
+
+class AnchoredVWAPEngine:
+    """누적기 모음. 갱신 시 종목별 마지막 봉 이후 구간만 한 번의 배치 다운로드로 수집
+
+    반환 프레임은 읽기 전용 배열을 공유하는 얕은 복사라 복사 비용이 없고, 호출 측의 제자리 수정은 거부되어 누적기/다른 세션에 영향 없음
+    """
+
+    def __init__(self, loader=load_price_panel, min_refresh_seconds=60, misses=yahoo_misses, flights=None,
+                 shared=shared_cache, shared_ttl=300, max_bytes=PRICE_CACHE_MAX_MB * 2**20, cache_name=None):
+        self.loader = loader
+        self.min_refresh_seconds = min_refresh_seconds
+        self.misses = misses
+        self.flights = flights or SingleFlight()
+        self.shared = shared
+        self.shared_ttl = shared_ttl
+        self._accumulators = SizedLRUCache(cache_name, max_bytes=max_bytes, sizeof=lambda acc: acc.nbytes)
+        self._refreshed_at = {}
+        # 명시적 새로고침으로 공유 캐시를 건너뛰고 Yahoo에서 직접 받아야 하는 종목
+        self._bypass_shared = set()
+        self._lock = threading.Lock()
+
+    def _stale(self, tickers, anchor, now):
+        return [t for t in tickers
+                if now - self._refreshed_at.get((t, anchor), float('-inf')) >= self.min_refresh_seconds
+                and not self.misses.is_known_miss(f"prices:{t}")]
+
+    def refresh(self, tickers, anchor):
+        # 다운로드 중에는 잠금을 풀어 두고, 같은 종목을 이미 받고 있는 세션이 있으면
+        # 다시 요청하지 않고 그 배치가 끝나기를 기다림 (종목별 single-flight)
+        anchor = pd.Timestamp(anchor)
+        with span('vwap.refresh') as trace:
+            with self._lock:
+                accs = {}
+                for ticker in tickers:
+                    key = (ticker, anchor)
+                    accs[ticker] = self._accumulators.get(key)
+                    if accs[ticker] is None:
+                        # 처음 보는 종목이거나 메모리 상한으로 제거된 종목은 앵커부터 다시 누적
+                        accs[ticker] = self._accumulators.put(key, AnchoredVWAPAccumulator(ticker, anchor))
+                        self._refreshed_at.pop(key, None)
+                stale = self._stale(tickers, anchor, time.monotonic())
+            trace.add(hits=len(tickers) - len(stale), misses=len(stale))
+
+            if stale:
+                self.flights.do_many([(t, anchor) for t in stale],
+                                     lambda owned: self._download([t for t, _ in owned], anchor, accs))
+
+            with self._lock:
+                return {ticker: acc.frame.copy(deep=False) for ticker, acc in accs.items()}
+
+    def _download(self, tickers, anchor, accs):
+        with self._lock:
+            # 대기 중 다른 호출이 이미 갱신한 종목은 제외
+            now = time.monotonic()
+            stale = self._stale(tickers, anchor, now)
+            if not stale:
+                return
+            starts = [accs[t].last_timestamp or anchor for t in stale]
+            # 공유 캐시는 앵커부터 처음 받는 종목에만 사용. 증분 갱신은 마지막(장중 미확정) 봉을 다시 받는 것이므로
+            # 다른 레플리카가 최대 shared_ttl 전에 받은 봉이 아닌 최신 봉을 받도록 항상 직접 다운로드
+            cold = [t for t in stale if accs[t].last_timestamp is None and t not in self._bypass_shared]
+        start = min(pd.Timestamp(s).tz_localize(None) for s in starts).normalize()
+        try:
+            bars_by_ticker = self._load_bars(stale, start, shared_tickers=cold)
+        except Exception as e:
+            for ticker in stale:
+                self.misses.record_miss(f"prices:{ticker}", e)
+            return
+
+        with self._lock:
+            for ticker in stale:
+                bars = bars_by_ticker[ticker]
+                if len(bars[0]):
+                    accs[ticker].update(bars)
+                    # 늘어난 크기로 다시 계산 (상한을 넘으면 오래 안 쓴 종목 제거)
+                    self._accumulators.put((ticker, anchor), accs[ticker])
+                    self.misses.record_hit(f"prices:{ticker}")
+                elif not accs[ticker].rows:
+                    self.misses.record_miss(f"prices:{ticker}", "no price data")
+                self._refreshed_at[(ticker, anchor)] = now
+            self._bypass_shared.difference_update(stale)
+
+    def _load_bars(self, tickers, start, shared_tickers=None):
+        # shared_tickers 중 같은 시작일로 다른 레플리카가 최근(shared_ttl 이내)에 받은 종목은 공유 캐시에서 가져오고
+        # 나머지만 한 번의 배치 다운로드 → 패널을 한 번에 종목별 봉 묶음으로 나눔
+        # 공유 캐시에는 다른 레플리카가 콜드 스타트에 찾는 shared_tickers의 결과만 다시 저장
+        keys = {t: f"prices:{t}:{start:%Y-%m-%d}" for t in tickers}
+        lookup = {keys[t]: t for t in tickers if shared_tickers is None or t in shared_tickers}
+        shared = self.shared.get_many(list(lookup)) if self.shared and lookup else {}
+        bars_by_ticker = {lookup[key]: frame_bars(df) for key, df in shared.items()}
+
+        missing = [t for t in tickers if t not in bars_by_ticker]
+        if missing:
+            bars_by_ticker.update(split_panel(self.loader(missing, start), missing))
+            if self.shared and self.shared.enabled:
+                for ticker in missing:
+                    if keys[ticker] in lookup and len(bars_by_ticker[ticker][0]):
+                        self.shared.set(keys[ticker], bars_frame(bars_by_ticker[ticker]), ttl=self.shared_ttl)
+        return bars_by_ticker
+
+    def frames(self, tickers, anchor):
+        """다운로드 없이 현재 누적된 프레임만 반환 (아직 없는 종목은 빈 DataFrame)"""
+        with self._lock:
+            accs = {ticker: self._accumulators.get((ticker, pd.Timestamp(anchor))) for ticker in tickers}
+            return {ticker: acc.frame.copy(deep=False) if acc is not None else pd.DataFrame()
+                    for ticker, acc in accs.items()}
+
+    def mark_stale(self, tickers=None, refresh=False):
+        # 누적합은 유지하고 다음 refresh에서 마지막 봉 이후만 다시 받도록 표시
+        # refresh=True(명시적 새로고침)면 누적기가 메모리 상한으로 제거돼 앵커부터 다시 받더라도 공유 캐시를 건너뜀
+        with self._lock:
+            for key in list(self._refreshed_at):
+                if tickers is None or key[0] in tickers:
+                    del self._refreshed_at[key]
+            if refresh:
+                self._bypass_shared.update(tickers if tickers is not None else {k[0] for k in self._accumulators.keys()})
+
+    def clear(self, tickers=None):
+        with self._lock:
+            self._accumulators.clear(lambda key: tickers is None or key[0] in tickers)
+            for key in list(self._refreshed_at):
+                if tickers is None or key[0] in tickers:
+                    del self._refreshed_at[key]
+
+
+vwap_engine = AnchoredVWAPEngine(flights=SingleFlight('vwap.prices'), cache_name='vwap.accumulators')
+
+
+# ==================== Yahoo 펀더멘털 스냅샷 ====================
+# VWAP 분석과 공매도 분석이 함께 쓰는 .info 필드
+FUNDAMENTAL_FIELDS = ['marketCap', 'shortRatio', 'shortPercentOfFloat', 'sharesShort', 'sharesShortPriorMonth']
+# 공유 캐시 보관 기간 (README의 업데이트 주기 1시간)
+FUNDAMENTALS_SHARED_TTL = 3600
+
+
+def fetch_fundamentals(ticker, refresh=False):
+    """yf.Ticker.info를 한 번 호출해 필요한 필드와 수집 시각만 보관 (실패 시 None)
+
+    여러 세션이 같은 종목을 동시에 요청하면 한 번만 호출하고 스냅샷을 공유
+    refresh=True(명시적 새로고침)면 공유 캐시를 건너뛰고 Yahoo에서 직접 받아 공유 캐시를 덮어씀
+    """
+    snapshot = info_flights.do((ticker, refresh), lambda: _fetch_fundamentals(ticker, refresh))
+    return dict(snapshot) if snapshot is not None else None
+
+
+def forget_fundamentals(tickers):
+    """새로고침: 다른 레플리카가 공유 캐시에 남긴 스냅샷을 지워 다음 fetch_fundamentals가 Yahoo로 가게 함"""
+    for ticker in tickers:
+        shared_cache.delete(f"info:{ticker}")
+
+
+def _fetch_fundamentals(ticker, refresh=False):
+    key = f"info:{ticker}"
+    if yahoo_misses.is_known_miss(key):
+        return None
+    # 다른 레플리카가 받은 스냅샷 (fetched_at은 원래 수집 시각 그대로)
+    snapshot = shared_cache.get(key) if not refresh else None
+    if snapshot is not None:
+        return snapshot
+    with span('yahoo.info') as trace:
+        try:
+            info = yf.Ticker(ticker).info
+        except Exception as e:
+            yahoo_misses.record_miss(key, e)
+            trace.fail(e)
+            return None
+    yahoo_misses.record_hit(key)
+
+    snapshot = {field: info[field] for field in FUNDAMENTAL_FIELDS if field in info}
+    snapshot['fetched_at'] = datetime.now()
+    shared_cache.set(key, snapshot, ttl=FUNDAMENTALS_SHARED_TTL)
+    return snapshot
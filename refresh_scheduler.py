@@ -0,0 +1,157 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from finra_data import finra_store
+from market_calendar import MARKET_TZ, is_market_open, last_session_close, published_trading_days
+from perf_trace import span
+from price_data import fetch_fundamentals, vwap_engine
+
+# ==================== 백그라운드 데이터 갱신 ====================
+# 페이지 렌더링은 네트워크를 기다리지 않고 공유 저장소(finra_store, vwap_engine, 펀더멘털 스냅샷)의
+# 최신 상태만 읽고, 실제 수집은 이 스케줄러가 장 시간/FINRA 게시 시각에 맞춰 수행
+
+JOBS = ('finra', 'prices', 'fundamentals')
+
+
+class RefreshScheduler:
+    """작업별 갱신 주기
+    - prices: 장중 price_interval 초마다, 장 마감 후에는 마지막 봉 확정을 위해 한 번
+    - finra: 기간 내 아직 없는 거래일 파일(새로 게시된 날짜, 일시 오류로 못 받은 과거 날짜)이 있으면 finra_retry 초 간격으로 재시도
+      (최근 finra_recheck 거래일만 negative 캐시를 무시하고, 그 이전 날짜는 negative 캐시의 백오프를 따름)
+    - fundamentals: fundamentals_interval 초마다
+    """
+
+    def __init__(self, tickers, anchor_fn, finra_days=60, price_interval=300, finra_retry=900, finra_recheck=2,
+                 fundamentals_interval=4 * 3600, poll_seconds=30, max_workers=8,
+                 store=finra_store, engine=vwap_engine):
+        self.tickers = tuple(tickers)
+        self.anchor_fn = anchor_fn
+        self.finra_days = finra_days
+        self.price_interval = price_interval
+        self.finra_retry = finra_retry
+        self.finra_recheck = finra_recheck
+        self.fundamentals_interval = fundamentals_interval
+        self.poll_seconds = poll_seconds
+        self.max_workers = max_workers
+        self.store = store
+        self.engine = engine
+
+        self.fundamentals = {}
+        self.last_updated = {}
+        self.last_error = {}
+        self._last_attempt = {}
+        self._forced = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._ready = threading.Event()
+        self._idle = threading.Event()
+        self._thread = None
+
+    # ---------- 외부 API ----------
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name='refresh-scheduler', daemon=True)
+                self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def trigger(self, jobs=JOBS):
+        """다음 루프에서 주기와 무관하게 즉시 갱신 (명시적 새로고침: 공유 캐시를 건너뛰고 업스트림에서 직접 수집)"""
+        with self._lock:
+            self._forced.update(jobs)
+            self._idle.clear()
+        self._wake.set()
+
+    def ready(self):
+        """첫 수집 루프가 끝났는지 (페이지는 기다리지 않고 그동안 '갱신 중'으로 표시)"""
+        return self._ready.is_set()
+
+    def busy(self):
+        """수집 중이거나 요청된 갱신(trigger)이 아직 끝나지 않았는지"""
+        return not self._idle.is_set()
+
+    def version(self):
+        """캐시 키로 쓰는 데이터 버전 (어느 작업이든 갱신되면 바뀜)"""
+        with self._lock:
+            return tuple(self.last_updated.get(job) for job in JOBS)
+
+    def snapshot_fundamentals(self, ticker):
+        with self._lock:
+            return self.fundamentals.get(ticker)
+
+    # ---------- 주기 판단 ----------
+    def _due(self, job, now):
+        last = self._last_attempt.get(job)
+        if job in self._forced or last is None:
+            return True
+        elapsed = time.monotonic() - last
+        if job == 'prices':
+            if is_market_open(now):
+                return elapsed >= self.price_interval
+            # 장 마감 후: 마감 이후 아직 받지 않았으면 한 번 더
+            updated = self.last_updated.get('prices')
+            return updated is None or updated < last_session_close(now)
+        if job == 'finra':
+            dates = published_trading_days(self.finra_days, now=now)
+            return any(not self.store.has_day(d) for d in dates) and elapsed >= self.finra_retry
+        return elapsed >= self.fundamentals_interval
+
+    # ---------- 작업 ----------
+    def refresh_finra(self, force=False):
+        dates = published_trading_days(self.finra_days)
+        # 게시 직후라 이전 조회가 404였을 수 있는 최근 거래일만 negative 캐시를 무시하고 다시 확인
+        # 과거 날짜의 반복 실패는 negative 캐시의 백오프 만료 시점에 재시도 (명시적 새로고침이면 모두 다시 확인)
+        recheck = dates if force else dates[:self.finra_recheck]
+        self.store.forget_missing([d for d in recheck if not self.store.has_day(d)])
+        self.store.matrix(dates)
+
+    def refresh_prices(self, force=False):
+        self.engine.mark_stale(self.tickers, refresh=force)
+        self.engine.refresh(self.tickers, self.anchor_fn())
+
+    def refresh_fundamentals(self, force=False):
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(self.tickers))) as executor:
+            snapshots = dict(zip(self.tickers, executor.map(lambda t: fetch_fundamentals(t, refresh=force), self.tickers)))
+        with self._lock:
+            # 실패한 종목은 이전 스냅샷 유지
+            self.fundamentals.update({t: s for t, s in snapshots.items() if s is not None})
+
+    def run_job(self, job):
+        self._last_attempt[job] = time.monotonic()
+        with self._lock:
+            forced = job in self._forced
+            self._forced.discard(job)
+        with span(f"scheduler.{job}") as trace:
+            try:
+                getattr(self, f"refresh_{job}")(force=forced)
+            except Exception as e:
+                trace.fail(e)
+                with self._lock:
+                    self.last_error[job] = (datetime.now(MARKET_TZ), repr(e))
+                return
+        with self._lock:
+            self.last_updated[job] = datetime.now(MARKET_TZ)
+            self.last_error.pop(job, None)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.clear()
+            now = datetime.now(MARKET_TZ)
+            due = [job for job in JOBS if self._due(job, now)]
+            # 작업끼리는 서로 다른 소스라 동시에 실행
+            if due:
+                with ThreadPoolExecutor(max_workers=len(due)) as executor:
+                    list(executor.map(self.run_job, due))
+            self._ready.set()
+            with self._lock:
+                if not self._forced:
+                    self._idle.set()
+            self._wake.wait(self.poll_seconds)
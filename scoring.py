@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+
+# ==================== 점수 계산 ====================
+def calculate_buy_score(row):
+    score = 0
+    if row['Is_Above_VWAP']: score += 30
+    price_diff = row['Price_vs_VWAP_%']
+    if 0 < price_diff <= 5: score += 20
+    elif 5 < price_diff <= 10: score += 10
+    elif price_diff > 10: score += 5
+    if row['Above_VWAP_Days_%'] >= 80: score += 20
+    elif row['Above_VWAP_Days_%'] >= 60: score += 15
+    if row['Uptrend_Strength_%'] >= 60: score += 15
+    elif row['Uptrend_Strength_%'] >= 50: score += 10
+    if row['Volume_Ratio'] >= 1.2: score += 15
+    elif row['Volume_Ratio'] >= 1.0: score += 10
+    return min(score, 100)
+
+def calculate_short_score(row):
+    short_pct = row.get('short_percent_float', 0)
+    if short_pct < 5: return 20
+    elif short_pct < 10: return 15
+    elif short_pct < 20: return 10
+    else: return 5
+
+
+# 아래 벡터화 버전은 위의 행 단위 함수와 결과가 동일 (df.apply(axis=1) 대체)
+def buy_scores(df):
+    price_diff = df['Price_vs_VWAP_%']
+    above_days = df['Above_VWAP_Days_%']
+    uptrend = df['Uptrend_Strength_%']
+    volume_ratio = df['Volume_Ratio']
+
+    score = np.where(df['Is_Above_VWAP'].astype(bool), 30, 0)
+    score += np.select(
+        [(price_diff > 0) & (price_diff <= 5), (price_diff > 5) & (price_diff <= 10), price_diff > 10],
+        [20, 10, 5], default=0)
+    score += np.select([above_days >= 80, above_days >= 60], [20, 15], default=0)
+    score += np.select([uptrend >= 60, uptrend >= 50], [15, 10], default=0)
+    score += np.select([volume_ratio >= 1.2, volume_ratio >= 1.0], [15, 10], default=0)
+    return pd.Series(np.minimum(score, 100).astype('int64'), index=df.index)
+
+def short_scores(df):
+    if 'short_percent_float' not in df.columns:
+        return pd.Series(20, index=df.index, dtype='int64')
+    short_pct = df['short_percent_float']
+    score = np.select([short_pct < 5, short_pct < 10, short_pct < 20], [20, 15, 10], default=5)
+    return pd.Series(score.astype('int64'), index=df.index)
+
+
+# ==================== 공매도 종합 점수 (고급 분석) ====================
+def _normalize_inverse(values, max_val):
+    return np.clip(100 - (values / max_val * 100), 0, 100)
+
+def short_pressure_scores(df):
+    """공매도 4개 지표를 0-100점으로 정규화 (낮을수록/감소할수록 높은 점수)하고 평균을 Total_Score로"""
+    scores = pd.DataFrame({
+        'Short%_Score': _normalize_inverse(df['short_percent_float'], 10),
+        'Days_Score': _normalize_inverse(df['short_ratio_days'], 5),
+        'FINRA_Score': _normalize_inverse(df['daily_short_ratio'], 60),
+        'Change_Score': np.clip(50 - df['short_change_pct'] * 2, 0, 100),
+    }, index=df.index)
+    scores['Total_Score'] = scores.sum(axis=1, skipna=False) / 4
+    return scores
@@ -0,0 +1,245 @@
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+from perf_trace import span, tracer
+
+# ==================== 프로세스 간 공유 캐시 ====================
+# 여러 대시보드 레플리카가 같은 FINRA 파일/Yahoo 응답을 한 번만 받도록 수집 결과를 공유 저장소에 보관
+# SHARED_CACHE_URL 예: sqlite:////var/cache/short-dashboard.db, redis://cache:6379/0 (미설정 시 비활성)
+SHARED_CACHE_URL = os.environ.get('SHARED_CACHE_URL', '')
+
+# 저장 형식이 바뀌면 올려서 이전 버전 값과 섞이지 않게 함
+KEY_VERSION = 'v2'
+
+
+# ==================== 직렬화 ====================
+# 공유 저장소는 다른 호스트도 쓸 수 있으므로 피클(역직렬화 시 임의 코드 실행 가능)을 쓰지 않고
+# DataFrame은 Parquet, 그 외(펀더멘털 스냅샷 dict 등)는 JSON으로만 저장 (읽는 쪽에서 코드가 실행될 여지 없음)
+def _json_default(obj):
+    if isinstance(obj, datetime):
+        return {'__datetime__': obj.isoformat()}
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"공유 캐시에 저장할 수 없는 값: {type(obj).__name__}")
+
+
+def _json_object(obj):
+    if len(obj) == 1 and '__datetime__' in obj:
+        return datetime.fromisoformat(obj['__datetime__'])
+    return obj
+
+
+def dumps(value):
+    if isinstance(value, pd.DataFrame):
+        buffer = BytesIO()
+        value.to_parquet(buffer, index=True)
+        return b'parquet:' + buffer.getvalue()
+    return b'json:' + json.dumps(value, default=_json_default, ensure_ascii=False).encode()
+
+
+def loads(raw):
+    raw = bytes(raw)
+    if raw.startswith(b'parquet:'):
+        return pd.read_parquet(BytesIO(raw[len(b'parquet:'):]))
+    if raw.startswith(b'json:'):
+        return json.loads(raw[len(b'json:'):], object_hook=_json_object)
+    raise ValueError("알 수 없는 공유 캐시 값 형식")
+
+
+class NullBackend:
+    """공유 캐시 미사용 (항상 미스)"""
+
+    def get(self, key):
+        return None
+
+    def set(self, key, value, ttl=None):
+        pass
+
+    def delete(self, key):
+        pass
+
+    def clear(self):
+        pass
+
+
+class SQLiteBackend:
+    """같은 호스트(또는 공유 볼륨)의 여러 프로세스가 함께 쓰는 SQLite 키-값 저장소 (WAL 모드)
+
+    만료 시각은 프로세스 간에 비교해야 하므로 monotonic이 아닌 벽시계 기준
+    """
+
+    PURGE_EVERY = 200
+
+    def __init__(self, path, timeout=30):
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        self._writes = 0
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn()
+
+    def _conn(self):
+        # sqlite3 연결은 스레드 간 공유하지 않고 스레드마다 하나씩
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL)')
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        row = self._conn().execute('SELECT value, expires_at FROM cache WHERE key = ?', (key,)).fetchone()
+        if row is None or (row[1] is not None and row[1] <= time.time()):
+            return None
+        return row[0]
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.time() + ttl if ttl else None
+        conn = self._conn()
+        conn.execute('INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)', (key, value, expires_at))
+        self._writes += 1
+        if self._writes % self.PURGE_EVERY == 0:
+            self.purge_expired()
+
+    def delete(self, key):
+        self._conn().execute('DELETE FROM cache WHERE key = ?', (key,))
+
+    def purge_expired(self):
+        self._conn().execute('DELETE FROM cache WHERE expires_at IS NOT NULL AND expires_at <= ?', (time.time(),))
+
+    def clear(self):
+        self._conn().execute('DELETE FROM cache')
+
+
+class RedisBackend:
+    """redis-py 호환 클라이언트(get / set(ex=) / delete / scan_iter)를 쓰는 저장소
+
+    여러 호스트의 레플리카가 공유. 로컬 검증은 같은 메서드를 가진 대역 객체로 가능
+    """
+
+    def __init__(self, client, prefix='short_dashboard:'):
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url, **kwargs):
+        import redis  # 선택 의존성: Redis 백엔드를 쓸 때만 필요 (pip install redis)
+        return cls(redis.Redis.from_url(url), **kwargs)
+
+    def get(self, key):
+        return self.client.get(self.prefix + key)
+
+    def set(self, key, value, ttl=None):
+        self.client.set(self.prefix + key, value, ex=math.ceil(ttl) if ttl else None)
+
+    def delete(self, key):
+        self.client.delete(self.prefix + key)
+
+    def clear(self):
+        for key in list(self.client.scan_iter(match=self.prefix + '*')):
+            self.client.delete(key)
+
+
+def backend_from_url(url):
+    """sqlite:///상대경로, sqlite:////절대경로, redis://..., rediss://... (빈 값이면 NullBackend)"""
+    if not url:
+        return NullBackend()
+    if url.startswith('sqlite:///'):
+        return SQLiteBackend(url[len('sqlite:///'):])
+    if url.startswith(('redis://', 'rediss://', 'unix://')):
+        return RedisBackend.from_url(url)
+    raise ValueError(f"지원하지 않는 SHARED_CACHE_URL: {url}")
+
+
+class SharedCache:
+    """수집 함수 결과를 Parquet/JSON으로 직렬화해 백엔드에 보관
+
+    백엔드 장애(Redis 연결 끊김, DB 잠금 등)는 미스로 취급해 업스트림 수집으로 넘어감
+    None(수집 실패)은 저장하지 않음 — 실패는 프로세스별 negative 캐시가 담당
+    """
+
+    def __init__(self, backend=None, name=None):
+        self.backend = backend or NullBackend()
+        self.errors = 0
+        if name:
+            tracer.register_counters('shared_cache', name, self.stats, totals=('errors',))
+
+    @property
+    def enabled(self):
+        return not isinstance(self.backend, NullBackend)
+
+    def _key(self, key):
+        return f"{KEY_VERSION}:{key}"
+
+    def get_many(self, keys):
+        """{key: 값} (없거나 만료된 키는 제외)"""
+        found = {}
+        if not self.enabled or not keys:
+            return found
+        with span('shared_cache.get') as trace:
+            for key in keys:
+                try:
+                    raw = self.backend.get(self._key(key))
+                    if raw is not None:
+                        found[key] = loads(raw)
+                        trace.add(bytes=len(raw))
+                except Exception:
+                    self.errors += 1
+            trace.add(hits=len(found), misses=len(keys) - len(found))
+        return found
+
+    def get(self, key):
+        return self.get_many([key]).get(key)
+
+    def set(self, key, value, ttl=None):
+        if not self.enabled or value is None:
+            return
+        with span('shared_cache.set') as trace:
+            try:
+                raw = dumps(value)
+                self.backend.set(self._key(key), raw, ttl)
+                trace.add(bytes=len(raw))
+            except Exception:
+                self.errors += 1
+
+    def fetch(self, key, fn, ttl=None):
+        """공유 캐시에 있으면 그 값, 없으면 fn()으로 수집해 저장"""
+        found = self.get_many([key])
+        if key in found:
+            return found[key]
+        value = fn()
+        self.set(key, value, ttl)
+        return value
+
+    def delete(self, key):
+        """명시적 새로고침 시 다른 레플리카가 남긴 값을 지워 다음 조회가 업스트림으로 가게 함"""
+        if not self.enabled:
+            return
+        try:
+            self.backend.delete(self._key(key))
+        except Exception:
+            self.errors += 1
+
+    def stats(self):
+        return {'backend': type(self.backend).__name__, 'errors': self.errors}
+
+    def clear(self):
+        try:
+            self.backend.clear()
+        except Exception:
+            self.errors += 1
+
+
+shared_cache = SharedCache(backend_from_url(SHARED_CACHE_URL), name='shared')
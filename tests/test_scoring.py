@@ -0,0 +1,95 @@
+"""벡터화 점수(buy_scores / short_scores)가 행 단위 함수(calculate_buy_score / calculate_short_score)와
+모든 구간 경계값, 결측치, 빈 프레임에서 같은 결과를 내는지 확인
+
+실행: python -m pytest tests
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scoring import buy_scores, calculate_buy_score, calculate_short_score, short_scores
+
+# 점수가 0점이 되는 기준 행 (각 테스트에서 한 컬럼만 바꿔 해당 구간 점수만 확인)
+BASE_ROW = {
+    'Is_Above_VWAP': False,
+    'Price_vs_VWAP_%': -1.0,
+    'Above_VWAP_Days_%': 0.0,
+    'Uptrend_Strength_%': 0.0,
+    'Volume_Ratio': 0.0,
+}
+
+
+def frame_with(column, values):
+    return pd.DataFrame([{**BASE_ROW, column: value} for value in values])
+
+
+def assert_same_scores(df, vectorized, row_wise):
+    expected = pd.Series([row_wise(row) for _, row in df.iterrows()], index=df.index, dtype='int64')
+    result = vectorized(df)
+    assert result.dtype == np.int64
+    pd.testing.assert_series_equal(result, expected)
+    return result
+
+
+@pytest.mark.parametrize('column, values, points', [
+    # 0 초과 5 이하 20점, 5 초과 10 이하 10점, 10 초과 5점
+    ('Price_vs_VWAP_%', [-0.01, 0.0, 0.01, 5.0, 5.01, 10.0, 10.01], [0, 0, 20, 20, 10, 10, 5]),
+    # 80 이상 20점, 60 이상 15점
+    ('Above_VWAP_Days_%', [59.99, 60.0, 79.99, 80.0, 100.0], [0, 15, 15, 20, 20]),
+    # 60 이상 15점, 50 이상 10점
+    ('Uptrend_Strength_%', [49.99, 50.0, 59.99, 60.0], [0, 10, 10, 15]),
+    # 1.2 이상 15점, 1.0 이상 10점
+    ('Volume_Ratio', [0.99, 1.0, 1.19, 1.2], [0, 10, 10, 15]),
+    ('Is_Above_VWAP', [False, True], [0, 30]),
+])
+def test_buy_score_thresholds(column, values, points):
+    result = assert_same_scores(frame_with(column, values), buy_scores, calculate_buy_score)
+    assert result.tolist() == points
+
+
+def test_buy_score_maximum():
+    row = {'Is_Above_VWAP': True, 'Price_vs_VWAP_%': 3.0, 'Above_VWAP_Days_%': 90.0,
+           'Uptrend_Strength_%': 70.0, 'Volume_Ratio': 1.5}
+    result = assert_same_scores(pd.DataFrame([row]), buy_scores, calculate_buy_score)
+    assert result.tolist() == [100]
+
+
+@pytest.mark.parametrize('column', ['Price_vs_VWAP_%', 'Above_VWAP_Days_%', 'Uptrend_Strength_%', 'Volume_Ratio'])
+def test_buy_score_missing_values(column):
+    # None은 숫자 컬럼에서 NaN이 되고, NaN은 어느 구간에도 들지 않아 0점
+    df = frame_with(column, [np.nan, None, 1.0])
+    df['Is_Above_VWAP'] = True
+    assert_same_scores(df, buy_scores, calculate_buy_score)
+
+
+@pytest.mark.parametrize('values, points', [
+    # 5 미만 20점, 10 미만 15점, 20 미만 10점, 그 이상 5점
+    ([4.99, 5.0, 9.99, 10.0, 19.99, 20.0, 50.0], [20, 15, 15, 10, 10, 5, 5]),
+    # 결측치는 어느 구간에도 들지 않아 5점
+    ([np.nan, None, 0.0], [5, 5, 20]),
+])
+def test_short_score_thresholds(values, points):
+    df = pd.DataFrame({'short_percent_float': values})
+    result = assert_same_scores(df, short_scores, calculate_short_score)
+    assert result.tolist() == points
+
+
+def test_short_score_without_column():
+    # 공매도 데이터가 전혀 없으면 행 단위 함수의 기본값(0%)과 같이 20점
+    df = pd.DataFrame({'Ticker': ['AAPL', 'MSFT']})
+    result = assert_same_scores(df, short_scores, calculate_short_score)
+    assert result.tolist() == [20, 20]
+
+
+def test_empty_frames():
+    df = pd.DataFrame({**{column: pd.Series(dtype='float64') for column in BASE_ROW},
+                       'short_percent_float': pd.Series(dtype='float64')})
+    for scores in (buy_scores(df), short_scores(df)):
+        assert scores.empty
+        assert scores.dtype == np.int64
+        assert scores.index.equals(df.index)